@@ -1,7 +1,9 @@
-from fastapi import FastAPI, HTTPException, status
+from fastapi import FastAPI, HTTPException, Query, Request, Response, status
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Literal, Optional
 from datetime import datetime
+from itertools import count, islice
+from uuid import uuid4
 
 app = FastAPI(title="Basic Task Management API", version="1.0.0")
 
@@ -23,28 +25,98 @@ class Task(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-# In-memory storage
-tasks_storage: List[Task] = []
-task_id_counter = 1
+class TaskStats(BaseModel):
+    total: int
+    completed: int
+    pending: int
 
-# Helper function to find task by ID
-def find_task_by_id(task_id: int) -> Optional[Task]:
-    return next((task for task in tasks_storage if task.id == task_id), None)
+class TaskBatchUpdate(TaskUpdate):
+    id: int
+
+class TaskBatch(BaseModel):
+    updates: List[TaskBatchUpdate] = []
+    deletes: List[int] = []
+
+class TaskBatchResult(BaseModel):
+    updated: List[Task]
+    deleted: List[int]
+
+# In-memory storage (keyed by task id; dicts keep insertion order)
+tasks_storage: Dict[int, Task] = {}
+task_id_counter = count(1)  # next() is a single C call, so ids never repeat
+tasks_revision = 0  # bumped on every mutation; used as the GET /tasks ETag
+# Distinguishes this process's revisions from an earlier run's, since the
+# counter restarts at 0 and the stored tasks are gone after a restart
+BOOT_ID = uuid4().hex
+
+# Helper function to record that the task list changed
+def bump_tasks_revision() -> None:
+    global tasks_revision
+    tasks_revision += 1
+
+# Helper function to check a request's If-None-Match header against an ETag
+def etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+# Helper function to apply the provided fields of an update to a task
+def apply_task_update(task: Task, task_update: TaskUpdate) -> Task:
+    if task_update.title is not None:
+        task.title = task_update.title
+    if task_update.description is not None:
+        task.description = task_update.description
+    if task_update.completed is not None:
+        task.completed = task_update.completed
+    
+    task.updated_at = datetime.now()
+    bump_tasks_revision()
+    return task
 
 # API Endpoints
 @app.get("/tasks", response_model=List[Task])
-async def get_all_tasks():
-    """Fetch all tasks"""
-    return tasks_storage
+async def get_all_tasks(
+    request: Request,
+    response: Response,
+    completed: Optional[bool] = None,
+    sort: Literal["created_at", "-created_at"] = "created_at",
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=1000)
+):
+    """Fetch tasks, optionally filtered by completion status and paginated"""
+    etag = f'W/"{BOOT_ID}-{tasks_revision}"'
+    cache_headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+    
+    response.headers.update(cache_headers)
+    
+    # Storage is in creation order, so sorting only means picking a direction
+    if sort == "created_at":
+        tasks = iter(tasks_storage.values())
+    else:
+        tasks = reversed(tasks_storage.values())
+    if completed is not None:
+        tasks = (task for task in tasks if task.completed == completed)
+    
+    stop = offset + limit if limit is not None else None
+    return list(islice(tasks, offset, stop))
+
+@app.get("/tasks/stats", response_model=TaskStats)
+async def get_task_stats():
+    """Count total, completed and pending tasks"""
+    total = len(tasks_storage)
+    completed = sum(task.completed for task in tasks_storage.values())
+    return TaskStats(total=total, completed=completed, pending=total - completed)
 
 @app.post("/tasks", response_model=Task, status_code=status.HTTP_201_CREATED)
 async def create_task(task_data: TaskCreate):
     """Create a new task"""
-    global task_id_counter
-    
     now = datetime.now()
     new_task = Task(
-        id=task_id_counter,
+        id=next(task_id_counter),
         title=task_data.title,
         description=task_data.description,
         completed=False,
@@ -52,15 +124,15 @@ async def create_task(task_data: TaskCreate):
         updated_at=now
     )
     
-    tasks_storage.append(new_task)
-    task_id_counter += 1
+    tasks_storage[new_task.id] = new_task
+    bump_tasks_revision()
     
     return new_task
 
 @app.put("/tasks/{task_id}", response_model=Task)
 async def update_task(task_id: int, task_update: TaskUpdate):
     """Update an existing task"""
-    task = find_task_by_id(task_id)
+    task = tasks_storage.get(task_id)
     
     if not task:
         raise HTTPException(
@@ -68,22 +140,40 @@ async def update_task(task_id: int, task_update: TaskUpdate):
             detail=f"Task with id {task_id} not found"
         )
     
-    # Update fields if provided
-    if task_update.title is not None:
-        task.title = task_update.title
-    if task_update.description is not None:
-        task.description = task_update.description
-    if task_update.completed is not None:
-        task.completed = task_update.completed
+    return apply_task_update(task, task_update)
+
+@app.post("/tasks/batch", response_model=TaskBatchResult)
+async def batch_update_tasks(batch: TaskBatch):
+    """Apply several task updates and deletes in one request"""
+    requested_ids = {update.id for update in batch.updates} | set(batch.deletes)
+    missing_ids = sorted(task_id for task_id in requested_ids if task_id not in tasks_storage)
     
-    task.updated_at = datetime.now()
+    # Reject the whole batch up front so it is applied all-or-nothing
+    if missing_ids:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Tasks with ids {missing_ids} not found"
+        )
     
-    return task
+    deleted_ids = list(dict.fromkeys(batch.deletes))
+    for update in batch.updates:
+        apply_task_update(tasks_storage[update.id], update)
+    for task_id in deleted_ids:
+        del tasks_storage[task_id]
+    if deleted_ids:
+        bump_tasks_revision()
+    
+    updated_tasks = [
+        tasks_storage[task_id]
+        for task_id in dict.fromkeys(update.id for update in batch.updates)
+        if task_id in tasks_storage
+    ]
+    return TaskBatchResult(updated=updated_tasks, deleted=deleted_ids)
 
 @app.delete("/tasks/{task_id}", status_code=status.HTTP_200_OK)
 async def delete_task(task_id: int):
     """Delete a task"""
-    task = find_task_by_id(task_id)
+    task = tasks_storage.get(task_id)
     
     if not task:
         raise HTTPException(
@@ -91,9 +181,12 @@ async def delete_task(task_id: int):
             detail=f"Task with id {task_id} not found"
         )
     
-    tasks_storage.remove(task)
+    del tasks_storage[task_id]
+    bump_tasks_revision()
     return {"message": f"Task {task_id} deleted successfully"}
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
+    # Single worker: tasks live in this process's memory, so extra workers
+    # would each see a different task list
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="uvloop", http="httptools") 
\ No newline at end of file
@@ -1,11 +1,15 @@
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
 import json
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+from urllib.parse import urlencode
 
 # Configuration
 API_BASE_URL = "http://localhost:8000"
+REQUEST_TIMEOUT = 5  # seconds
+PAGE_SIZE = 50  # tasks fetched per page
 
 # Page configuration
 st.set_page_config(
@@ -49,18 +53,28 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+@st.cache_resource
+def get_http_session() -> requests.Session:
+    """Shared HTTP session so API calls reuse pooled keep-alive connections"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
 def make_api_request(method: str, endpoint: str, data: Dict[Any, Any] = None) -> Dict[Any, Any]:
     """Make API request to FastAPI backend"""
     url = f"{API_BASE_URL}{endpoint}"
+    session = get_http_session()
     try:
         if method == "GET":
-            response = requests.get(url)
+            response = session.get(url, timeout=REQUEST_TIMEOUT)
         elif method == "POST":
-            response = requests.post(url, json=data)
+            response = session.post(url, json=data, timeout=REQUEST_TIMEOUT)
         elif method == "PUT":
-            response = requests.put(url, json=data)
+            response = session.put(url, json=data, timeout=REQUEST_TIMEOUT)
         elif method == "DELETE":
-            response = requests.delete(url)
+            response = session.delete(url, timeout=REQUEST_TIMEOUT)
         
         if response.status_code in [200, 201]:
             return response.json() if response.content else {}
@@ -70,26 +84,73 @@ def make_api_request(method: str, endpoint: str, data: Dict[Any, Any] = None) ->
     except requests.exceptions.ConnectionError:
         st.error("❌ Cannot connect to the API. Make sure the FastAPI server is running on http://localhost:8000")
         return {}
+    except requests.exceptions.Timeout:
+        st.error(f"❌ The API did not respond within {REQUEST_TIMEOUT} seconds")
+        return {}
     except Exception as e:
         st.error(f"Error: {str(e)}")
         return {}
 
-def get_tasks() -> List[Dict[Any, Any]]:
-    """Fetch all tasks from API"""
-    return make_api_request("GET", "/tasks") or []
+@st.cache_data(ttl=2)
+def fetch_tasks(nonce: int, completed: Optional[bool], offset: int) -> List[Dict[Any, Any]]:
+    """Fetch one page of tasks (newest first) from API, cached per mutation nonce"""
+    params = {"sort": "-created_at", "offset": offset, "limit": PAGE_SIZE}
+    if completed is not None:
+        params["completed"] = "true" if completed else "false"
+    return make_api_request("GET", f"/tasks?{urlencode(params)}") or []
+
+@st.cache_data(ttl=2)
+def fetch_task_stats(nonce: int) -> Dict[str, int]:
+    """Fetch task counts from API, cached per mutation nonce"""
+    return make_api_request("GET", "/tasks/stats")
+
+def get_tasks(completed: Optional[bool] = None, offset: int = 0) -> List[Dict[Any, Any]]:
+    """Fetch a page of tasks, reusing the cached page until a task is mutated"""
+    return fetch_tasks(st.session_state.get("tasks_nonce", 0), completed, offset)
+
+def get_task_stats() -> Dict[str, int]:
+    """Fetch task counts, reusing the cached counts until a task is mutated"""
+    return fetch_task_stats(st.session_state.get("tasks_nonce", 0))
+
+def invalidate_tasks() -> None:
+    """Bump the nonce so the next get_tasks() call refetches"""
+    st.session_state.tasks_nonce = st.session_state.get("tasks_nonce", 0) + 1
 
 def create_task(title: str, description: str = "") -> Dict[Any, Any]:
     """Create a new task"""
     data = {"title": title, "description": description}
-    return make_api_request("POST", "/tasks", data)
+    result = make_api_request("POST", "/tasks", data)
+    invalidate_tasks()
+    return result
 
 def update_task(task_id: int, **kwargs) -> Dict[Any, Any]:
     """Update a task"""
-    return make_api_request("PUT", f"/tasks/{task_id}", kwargs)
+    result = make_api_request("PUT", f"/tasks/{task_id}", kwargs)
+    invalidate_tasks()
+    return result
 
 def delete_task(task_id: int) -> Dict[Any, Any]:
     """Delete a task"""
-    return make_api_request("DELETE", f"/tasks/{task_id}")
+    result = make_api_request("DELETE", f"/tasks/{task_id}")
+    invalidate_tasks()
+    return result
+
+def apply_task_changes(updates: Dict[int, bool], deletes: List[int]) -> Dict[Any, Any]:
+    """Send queued completion toggles and deletes as one batch request"""
+    data = {
+        "updates": [{"id": task_id, "completed": completed} for task_id, completed in updates.items()],
+        "deletes": deletes
+    }
+    result = make_api_request("POST", "/tasks/batch", data)
+    invalidate_tasks()
+    return result
+
+def clear_pending_changes() -> None:
+    """Forget queued changes and reset the checkboxes they touched"""
+    for task_id in st.session_state.pending_updates:
+        st.session_state.pop(f"checkbox_{task_id}", None)
+    st.session_state.pending_updates = {}
+    st.session_state.pending_deletes = []
 
 def format_datetime(dt_string: str) -> str:
     """Format datetime string for display"""
@@ -126,14 +187,22 @@ def main():
                 else:
                     st.error("❌ Task title is required")
 
+    # Checkbox toggles and deletes are queued here and sent as one batch
+    if 'pending_updates' not in st.session_state:
+        st.session_state.pending_updates = {}
+    if 'pending_deletes' not in st.session_state:
+        st.session_state.pending_deletes = []
+    pending_updates = st.session_state.pending_updates
+    pending_deletes = st.session_state.pending_deletes
+
     # Main content area
-    tasks = get_tasks()
+    stats = get_task_stats()
     
-    if tasks:
+    if stats.get('total'):
         # Statistics
-        total_tasks = len(tasks)
-        completed_tasks = len([t for t in tasks if t.get('completed', False)])
-        pending_tasks = total_tasks - completed_tasks
+        total_tasks = stats['total']
+        completed_tasks = stats['completed']
+        pending_tasks = stats['pending']
         
         col1, col2, col3 = st.columns(3)
         with col1:
@@ -152,16 +221,22 @@ def main():
             ["All Tasks", "Pending Tasks", "Completed Tasks"]
         )
         
-        # Filter tasks based on selection
+        # Filtering, sorting (newest first) and paging happen on the API
         if filter_option == "Pending Tasks":
-            filtered_tasks = [t for t in tasks if not t.get('completed', False)]
+            completed_filter, filtered_count = False, pending_tasks
         elif filter_option == "Completed Tasks":
-            filtered_tasks = [t for t in tasks if t.get('completed', False)]
+            completed_filter, filtered_count = True, completed_tasks
         else:
-            filtered_tasks = tasks
+            completed_filter, filtered_count = None, total_tasks
         
-        # Sort tasks by creation date (newest first)
-        filtered_tasks.sort(key=lambda x: x.get('created_at', ''), reverse=True)
+        page = 1
+        if filtered_count > PAGE_SIZE:
+            page_count = (filtered_count + PAGE_SIZE - 1) // PAGE_SIZE
+            page = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1)
+        filtered_tasks = get_tasks(completed_filter, (page - 1) * PAGE_SIZE)
+        
+        # Filled in after the task list so it reflects this run's changes
+        action_bar = st.container()
         
         # Display tasks
         for task in filtered_tasks:
@@ -184,9 +259,9 @@ def main():
                         help="Mark as complete/incomplete"
                     )
                     if new_status != completed:
-                        result = update_task(task_id, completed=new_status)
-                        if result:
-                            st.rerun()
+                        pending_updates[task_id] = new_status
+                    else:
+                        pending_updates.pop(task_id, None)
                 
                 with col2:
                     # Task details
@@ -204,22 +279,48 @@ def main():
                 
                 with col3:
                     # Status badge
-                    if completed:
+                    if task_id in pending_deletes:
+                        st.warning("🗑️ Will be deleted")
+                    elif completed:
                         st.success("✅ Completed")
                     else:
                         st.info("⏳ Pending")
                 
                 with col4:
-                    # Delete button
-                    if st.button("🗑️", key=f"delete_{task_id}", help="Delete task"):
-                        result = delete_task(task_id)
-                        if result:
-                            st.success("Task deleted!")
+                    # Delete button (toggles the task in the pending batch)
+                    if task_id in pending_deletes:
+                        if st.button("↩️", key=f"delete_{task_id}", help="Keep task"):
+                            pending_deletes.remove(task_id)
                             st.rerun()
-                        else:
-                            st.error("Failed to delete task")
+                    elif st.button("🗑️", key=f"delete_{task_id}", help="Delete task"):
+                        pending_deletes.append(task_id)
+                        st.rerun()
                 
                 st.divider()
+        
+        # Pending changes (only the tasks shown on this page can be queued)
+        task_ids = {t.get('id') for t in filtered_tasks}
+        for task_id in [t_id for t_id in pending_updates if t_id not in task_ids]:
+            del pending_updates[task_id]
+        pending_deletes[:] = [t_id for t_id in pending_deletes if t_id in task_ids]
+        
+        change_count = len(pending_updates) + len(pending_deletes)
+        if change_count:
+            with action_bar:
+                col1, col2 = st.columns(2)
+                with col1:
+                    if st.button(f"💾 Apply {change_count} change(s)", use_container_width=True):
+                        result = apply_task_changes(pending_updates, list(pending_deletes))
+                        if result:
+                            clear_pending_changes()
+                            st.success("✅ Changes applied!")
+                            st.rerun()
+                        else:
+                            st.error("❌ Failed to apply changes")
+                with col2:
+                    if st.button("↩️ Discard changes", use_container_width=True):
+                        clear_pending_changes()
+                        st.rerun()
     
     else:
         # Empty state
@@ -1,140 +1,211 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
-from models import Expense
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, func, insert, lambda_stmt, select, update
+from sqlalchemy.sql.lambdas import StatementLambdaElement
+from models import CategoryTotal, DailyTotal, Expense
 from schemas import ExpenseCreate, ExpenseUpdate
-from datetime import datetime, date
-from typing import Optional, List
+from datetime import datetime, date, time
+from typing import AsyncIterator, Optional, List, Tuple
 
-def create_expense(db: Session, expense: ExpenseCreate) -> Expense:
+def _add_expense_filters(
+    stmt: StatementLambdaElement,
+    category: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+) -> StatementLambdaElement:
+    """Add the WHERE conditions shared by the expense queries.
+    
+    Each condition is its own lambda, so SQLAlchemy compiles every
+    combination of filters once and then only rebinds the values.
+    """
+    if category:
+        stmt += lambda s: s.where(Expense.category == category)
+    
+    if start_date:
+        stmt += lambda s: s.where(Expense.date >= start_date)
+    
+    if end_date:
+        # Include the entire end date
+        end_of_day = datetime.combine(end_date, time.max)
+        stmt += lambda s: s.where(Expense.date <= end_of_day)
+    
+    return stmt
+
+async def create_expense(db: AsyncSession, expense: ExpenseCreate) -> Expense:
     """Create a new expense"""
-    expense_data = expense.dict()
+    expense_data = expense.model_dump()
     if expense_data.get('date') is None:
         expense_data['date'] = datetime.utcnow()
     
     db_expense = Expense(**expense_data)
     db.add(db_expense)
-    db.commit()
-    db.refresh(db_expense)
+    await db.commit()
+    await db.refresh(db_expense)
     return db_expense
 
-def get_expense(db: Session, expense_id: int) -> Optional[Expense]:
+async def create_expenses_bulk(db: AsyncSession, expenses: List[ExpenseCreate]) -> int:
+    """Insert many expenses in a single transaction"""
+    now = datetime.utcnow()
+    rows = []
+    for expense in expenses:
+        expense_data = expense.model_dump()
+        if expense_data.get('date') is None:
+            expense_data['date'] = now
+        expense_data['created_at'] = now
+        expense_data['updated_at'] = now
+        rows.append(expense_data)
+    
+    if rows:
+        await db.execute(insert(Expense), rows)
+        await db.commit()
+    return len(rows)
+
+async def get_expense(db: AsyncSession, expense_id: int) -> Optional[Expense]:
     """Get a single expense by ID"""
-    return db.query(Expense).filter(Expense.id == expense_id).first()
+    result = await db.execute(select(Expense).where(Expense.id == expense_id))
+    return result.scalar_one_or_none()
 
-def get_expenses(
-    db: Session, 
-    skip: int = 0, 
+async def get_expenses(
+    db: AsyncSession,
+    skip: int = 0,
     limit: int = 100,
     category: Optional[str] = None,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None
-) -> List[Expense]:
-    """Get expenses with optional filtering"""
-    query = db.query(Expense)
-    
-    # Apply filters
-    if category:
-        query = query.filter(Expense.category == category)
-    
-    if start_date:
-        query = query.filter(Expense.date >= start_date)
-    
-    if end_date:
-        # Include the entire end date by adding 1 day
-        end_datetime = datetime.combine(end_date, datetime.max.time())
-        query = query.filter(Expense.date <= end_datetime)
-    
-    return query.order_by(Expense.date.desc()).offset(skip).limit(limit).all()
+) -> Tuple[List[Expense], int, float, Optional[datetime]]:
+    """Get a page of expenses plus the filtered count, amount total and
+    latest updated_at.
+    
+    The aggregates are computed with window functions over the filtered set,
+    so the page and its summary values come back in one query.
+    """
+    stmt = lambda_stmt(lambda: select(
+        Expense,
+        func.count().over().label('total_count'),
+        func.sum(Expense.amount).over().label('filtered_total'),
+        func.max(Expense.updated_at).over().label('last_updated')
+    ))
+    stmt = _add_expense_filters(stmt, category, start_date, end_date)
+    stmt += lambda s: s.order_by(Expense.date.desc()).offset(skip).limit(limit)
+    
+    result = await db.execute(stmt)
+    rows = result.all()
+    if not rows:
+        if not skip:
+            return [], 0, 0.0, None
+        # Paged past the end: no row is left to carry the window aggregates,
+        # so read them with a plain aggregate over the same filters
+        summary = lambda_stmt(lambda: select(
+            func.count(), func.sum(Expense.amount), func.max(Expense.updated_at)
+        ))
+        summary = _add_expense_filters(summary, category, start_date, end_date)
+        total_count, filtered_total, last_updated = (await db.execute(summary)).one()
+        return [], int(total_count), float(filtered_total or 0), last_updated
+
+    return (
+        [row.Expense for row in rows],
+        int(rows[0].total_count),
+        float(rows[0].filtered_total or 0),
+        rows[0].last_updated
+    )
 
-def get_expenses_count(
-    db: Session,
+async def stream_expenses(
+    db: AsyncSession,
     category: Optional[str] = None,
     start_date: Optional[date] = None,
-    end_date: Optional[date] = None
-) -> int:
-    """Get count of expenses with optional filtering"""
-    query = db.query(Expense)
-    
-    if category:
-        query = query.filter(Expense.category == category)
-    
-    if start_date:
-        query = query.filter(Expense.date >= start_date)
-    
-    if end_date:
-        end_datetime = datetime.combine(end_date, datetime.max.time())
-        query = query.filter(Expense.date <= end_datetime)
-    
-    return query.count()
+    end_date: Optional[date] = None,
+    batch_size: int = 200
+) -> AsyncIterator[Expense]:
+    """Yield filtered expenses newest first, fetching batch_size rows at a time"""
+    stmt = _add_expense_filters(lambda_stmt(lambda: select(Expense)), category, start_date, end_date)
+    stmt += lambda s: s.order_by(Expense.date.desc())
+    result = await db.stream_scalars(stmt, execution_options={"yield_per": batch_size})
+    async for expense in result:
+        yield expense
 
-def update_expense(db: Session, expense_id: int, expense_update: ExpenseUpdate) -> Optional[Expense]:
-    """Update an existing expense"""
-    db_expense = get_expense(db, expense_id)
-    if not db_expense:
-        return None
-    
-    update_data = expense_update.dict(exclude_unset=True)
-    if update_data:
-        update_data['updated_at'] = datetime.utcnow()
-        for field, value in update_data.items():
-            setattr(db_expense, field, value)
-        
-        db.commit()
-        db.refresh(db_expense)
-    
+async def update_expense(db: AsyncSession, expense_id: int, expense_update: ExpenseUpdate) -> Optional[Expense]:
+    """Update an existing expense with a single UPDATE ... RETURNING"""
+    update_data = expense_update.model_dump(exclude_unset=True)
+    if not update_data:
+        return await get_expense(db, expense_id)
+    
+    update_data['updated_at'] = datetime.utcnow()
+    result = await db.execute(
+        update(Expense)
+        .where(Expense.id == expense_id)
+        .values(**update_data)
+        .returning(Expense)
+    )
+    db_expense = result.scalar_one_or_none()
+    await db.commit()
     return db_expense
 
-def delete_expense(db: Session, expense_id: int) -> bool:
+async def delete_expense(db: AsyncSession, expense_id: int) -> bool:
     """Delete an expense"""
-    db_expense = get_expense(db, expense_id)
+    db_expense = await get_expense(db, expense_id)
     if not db_expense:
         return False
     
-    db.delete(db_expense)
-    db.commit()
+    await db.delete(db_expense)
+    await db.commit()
     return True
 
-def get_expenses_by_category(db: Session, category: str) -> List[Expense]:
+async def delete_expenses_bulk(db: AsyncSession, expense_ids: List[int]) -> List[int]:
+    """Delete several expenses in one statement and return the ids that existed"""
+    result = await db.execute(
+        delete(Expense).where(Expense.id.in_(expense_ids)).returning(Expense.id)
+    )
+    deleted_ids = sorted(result.scalars().all())
+    await db.commit()
+    return deleted_ids
+
+async def get_expenses_by_category(db: AsyncSession, category: str) -> List[Expense]:
     """Get all expenses for a specific category"""
-    return db.query(Expense).filter(Expense.category == category).order_by(Expense.date.desc()).all()
+    result = await db.execute(
+        select(Expense).where(Expense.category == category).order_by(Expense.date.desc())
+    )
+    return list(result.scalars().all())
 
-def get_total_expenses(
-    db: Session,
+async def get_total_expenses(
+    db: AsyncSession,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None
 ) -> dict:
-    """Get total expenses and breakdown by category"""
-    query = db.query(Expense)
-    
-    # Apply date filters
-    if start_date:
-        query = query.filter(Expense.date >= start_date)
-    
-    if end_date:
-        end_datetime = datetime.combine(end_date, datetime.max.time())
-        query = query.filter(Expense.date <= end_datetime)
-    
-    # Get total amount and count
-    total_result = query.with_entities(
-        func.sum(Expense.amount).label('total_amount'),
-        func.count(Expense.id).label('total_count')
-    ).first()
-    
-    total_amount = float(total_result.total_amount or 0)
-    total_count = int(total_result.total_count or 0)
-    
-    # Get category breakdown
+    """Get total expenses and breakdown by category
+    
+    Reads the trigger-maintained rollups instead of the expense rows: the
+    per-category table for all-time totals, or the per-day table summed over
+    the requested days for a bounded range.
+    """
+    if not start_date and not end_date:
+        stmt = lambda_stmt(lambda: select(
+            CategoryTotal.category, CategoryTotal.total, CategoryTotal.count
+        ).order_by(CategoryTotal.category))
+    else:
+        stmt = lambda_stmt(lambda: select(
+            DailyTotal.category,
+            func.sum(DailyTotal.total).label('category_total'),
+            func.sum(DailyTotal.count).label('category_count')
+        ))
+        if start_date:
+            stmt += lambda s: s.where(DailyTotal.day >= start_date)
+        if end_date:
+            stmt += lambda s: s.where(DailyTotal.day <= end_date)
+        stmt += lambda s: s.group_by(DailyTotal.category)
+    
+    total_amount = 0.0
+    total_count = 0
     category_breakdown = {}
-    category_results = query.with_entities(
-        Expense.category,
-        func.sum(Expense.amount).label('category_total')
-    ).group_by(Expense.category).all()
+    category_results = (await db.execute(stmt)).all()
     
-    for category, amount in category_results:
-        category_breakdown[category] = float(amount or 0)
+    for category, amount, count in category_results:
+        # Running sums pick up float noise; amounts are stored to the cent
+        amount = round(float(amount or 0), 2)
+        category_breakdown[category] = amount
+        total_amount += amount
+        total_count += int(count)
     
     return {
-        "total_amount": total_amount,
+        "total_amount": round(total_amount, 2),
         "total_count": total_count,
         "category_breakdown": category_breakdown
-    } 
\ No newline at end of file
+    }
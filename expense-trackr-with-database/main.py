@@ -1,14 +1,25 @@
-from fastapi import FastAPI, HTTPException, Depends, Query
+from fastapi import FastAPI, HTTPException, Depends, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, date
 from typing import Optional, List
+import asyncio
+import json
+import os
 import uvicorn
 
-from models import create_tables, get_db, EXPENSE_CATEGORIES
-from schemas import ExpenseCreate, ExpenseUpdate, ExpenseResponse, ExpenseTotal, ExpensesResponse
+from models import create_tables, engine, get_db, SessionLocal, EXPENSE_CATEGORIES, EXPENSE_CATEGORIES_SET
+from schemas import (
+    ExpenseCreate, ExpenseUpdate, ExpenseResponse, ExpenseTotal, ExpensesResponse,
+    ExpenseBulkDelete, ExpenseBulkDeleteResult
+)
 import crud
 
+# The category list never changes at runtime, so encode it once
+CATEGORIES_JSON = json.dumps(EXPENSE_CATEGORIES).encode("utf-8")
+INVALID_CATEGORY_DETAIL = f"Invalid category. Must be one of: {', '.join(EXPENSE_CATEGORIES)}"
+
 # Create FastAPI app
 app = FastAPI(
     title="Expense Tracker API",
@@ -25,12 +36,32 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Create tables on startup
+# Set by `python main.py` once it has created the schema, so the workers it
+# starts don't each run the DDL and race on the same SQLite file
+SCHEMA_READY_ENV = "EXPENSES_SCHEMA_READY"
+
+async def init_database():
+    """Create the schema once, before any worker starts"""
+    await create_tables()
+    # Pooled connections belong to this event loop; the server runs its own
+    await engine.dispose()
+
+# Create tables on startup (e.g. under `uvicorn main:app`)
 @app.on_event("startup")
 async def startup_event():
-    create_tables()
+    if os.getenv(SCHEMA_READY_ENV) == "1":
+        return
+    await create_tables()
     print("Database tables created successfully!")
 
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check the request's If-None-Match header against an ETag"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
 @app.get("/", tags=["Root"])
 async def root():
     """Root endpoint with API information"""
@@ -40,9 +71,11 @@ async def root():
         "docs": "/docs",
         "endpoints": {
             "GET /expenses": "Fetch all expenses",
+            "GET /expenses/stream": "Stream all matching expenses as NDJSON",
             "POST /expenses": "Create a new expense",
             "PUT /expenses/{expense_id}": "Update an existing expense",
             "DELETE /expenses/{expense_id}": "Delete an expense",
+            "POST /expenses/bulk_delete": "Delete several expenses in one request",
             "GET /expenses/category/{category}": "Filter expenses by category",
             "GET /expenses/total": "Get total expenses and breakdown by category"
         }
@@ -51,24 +84,26 @@ async def root():
 @app.get("/categories", response_model=List[str], tags=["Categories"])
 async def get_categories():
     """Get all available expense categories"""
-    return EXPENSE_CATEGORIES
+    return Response(content=CATEGORIES_JSON, media_type="application/json")
 
 @app.get("/expenses", response_model=ExpensesResponse, tags=["Expenses"])
 async def get_expenses(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
     category: Optional[str] = Query(None, description="Filter by category"),
     start_date: Optional[date] = Query(None, description="Filter from date (YYYY-MM-DD)"),
     end_date: Optional[date] = Query(None, description="Filter to date (YYYY-MM-DD)"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Fetch all expenses with optional filtering"""
     try:
         # Validate category if provided
-        if category and category not in EXPENSE_CATEGORIES:
+        if category and category not in EXPENSE_CATEGORIES_SET:
             raise HTTPException(
                 status_code=400,
-                detail=f"Invalid category. Must be one of: {', '.join(EXPENSE_CATEGORIES)}"
+                detail=INVALID_CATEGORY_DETAIL
             )
         
         # Validate date range
@@ -78,7 +113,7 @@ async def get_expenses(
                 detail="start_date must be before or equal to end_date"
             )
         
-        expenses = crud.get_expenses(
+        expenses, total_count, filtered_total, last_updated = await crud.get_expenses(
             db=db,
             skip=skip,
             limit=limit,
@@ -87,30 +122,88 @@ async def get_expenses(
             end_date=end_date
         )
         
-        total_count = crud.get_expenses_count(
+        # Any insert, update or delete in the filtered set changes the count
+        # or the latest updated_at, so together they make a cheap validator
+        last_updated_us = int(last_updated.timestamp() * 1_000_000) if last_updated else 0
+        etag = f'W/"{total_count}-{last_updated_us}"'
+        cache_headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag_matches(request, etag):
+            return Response(status_code=304, headers=cache_headers)
+        response.headers.update(cache_headers)
+        
+        # Rows come straight from our own table, so they skip re-validation
+        return {
+            "expenses": [ExpenseResponse.from_orm_trusted(expense) for expense in expenses],
+            "total_count": total_count,
+            "filtered_total": filtered_total
+        }
+    
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+@app.get("/expenses/stream", tags=["Expenses"])
+async def stream_expenses(
+    category: Optional[str] = Query(None, description="Filter by category"),
+    start_date: Optional[date] = Query(None, description="Filter from date (YYYY-MM-DD)"),
+    end_date: Optional[date] = Query(None, description="Filter to date (YYYY-MM-DD)")
+):
+    """Stream all matching expenses as newline-delimited JSON"""
+    if category and category not in EXPENSE_CATEGORIES_SET:
+        raise HTTPException(
+            status_code=400,
+            detail=INVALID_CATEGORY_DETAIL
+        )
+    
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(
+            status_code=400,
+            detail="start_date must be before or equal to end_date"
+        )
+    
+    async def generate_lines():
+        # The session is opened here so it stays alive until the last row is sent
+        async with SessionLocal() as db:
+            async for expense in crud.stream_expenses(
+                db=db,
+                category=category,
+                start_date=start_date,
+                end_date=end_date
+            ):
+                yield ExpenseResponse.from_orm_trusted(expense).model_dump_json() + "\n"
+    
+    return StreamingResponse(generate_lines(), media_type="application/x-ndjson")
+
+@app.get("/expenses/total", response_model=ExpenseTotal, tags=["Expenses"])
+async def get_total_expenses(
+    start_date: Optional[date] = Query(None, description="Filter from date (YYYY-MM-DD)"),
+    end_date: Optional[date] = Query(None, description="Filter to date (YYYY-MM-DD)"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get total expenses and breakdown by category"""
+    try:
+        # Validate date range
+        if start_date and end_date and start_date > end_date:
+            raise HTTPException(
+                status_code=400,
+                detail="start_date must be before or equal to end_date"
+            )
+        
+        total_data = await crud.get_total_expenses(
             db=db,
-            category=category,
             start_date=start_date,
             end_date=end_date
         )
         
-        # Calculate filtered total
-        filtered_total = sum(expense.amount for expense in expenses)
-        
-        return ExpensesResponse(
-            expenses=expenses,
-            total_count=total_count,
-            filtered_total=filtered_total
-        )
+        return ExpenseTotal(**total_data)
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @app.post("/expenses", response_model=ExpenseResponse, tags=["Expenses"])
-async def create_expense(expense: ExpenseCreate, db: Session = Depends(get_db)):
+async def create_expense(expense: ExpenseCreate, db: AsyncSession = Depends(get_db)):
     """Create a new expense"""
     try:
-        db_expense = crud.create_expense(db=db, expense=expense)
+        db_expense = await crud.create_expense(db=db, expense=expense)
         return db_expense
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -118,22 +211,22 @@ async def create_expense(expense: ExpenseCreate, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @app.get("/expenses/{expense_id}", response_model=ExpenseResponse, tags=["Expenses"])
-async def get_expense(expense_id: int, db: Session = Depends(get_db)):
+async def get_expense(expense_id: int, db: AsyncSession = Depends(get_db)):
     """Get a specific expense by ID"""
-    db_expense = crud.get_expense(db=db, expense_id=expense_id)
+    db_expense = await crud.get_expense(db=db, expense_id=expense_id)
     if not db_expense:
         raise HTTPException(status_code=404, detail="Expense not found")
-    return db_expense
+    return ExpenseResponse.from_orm_trusted(db_expense)
 
 @app.put("/expenses/{expense_id}", response_model=ExpenseResponse, tags=["Expenses"])
 async def update_expense(
     expense_id: int,
     expense_update: ExpenseUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Update an existing expense"""
     try:
-        db_expense = crud.update_expense(db=db, expense_id=expense_id, expense_update=expense_update)
+        db_expense = await crud.update_expense(db=db, expense_id=expense_id, expense_update=expense_update)
         if not db_expense:
             raise HTTPException(status_code=404, detail="Expense not found")
         return db_expense
@@ -143,50 +236,45 @@ async def update_expense(
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @app.delete("/expenses/{expense_id}", tags=["Expenses"])
-async def delete_expense(expense_id: int, db: Session = Depends(get_db)):
+async def delete_expense(expense_id: int, db: AsyncSession = Depends(get_db)):
     """Delete an expense"""
-    success = crud.delete_expense(db=db, expense_id=expense_id)
+    success = await crud.delete_expense(db=db, expense_id=expense_id)
     if not success:
         raise HTTPException(status_code=404, detail="Expense not found")
     return {"message": "Expense deleted successfully"}
 
+@app.post("/expenses/bulk_delete", response_model=ExpenseBulkDeleteResult, tags=["Expenses"])
+async def bulk_delete_expenses(bulk_delete: ExpenseBulkDelete, db: AsyncSession = Depends(get_db)):
+    """Delete several expenses in one request; unknown ids are skipped"""
+    deleted_ids = await crud.delete_expenses_bulk(db=db, expense_ids=bulk_delete.ids)
+    return ExpenseBulkDeleteResult(deleted=deleted_ids)
+
 @app.get("/expenses/category/{category}", response_model=List[ExpenseResponse], tags=["Expenses"])
-async def get_expenses_by_category(category: str, db: Session = Depends(get_db)):
+async def get_expenses_by_category(category: str, db: AsyncSession = Depends(get_db)):
     """Filter expenses by category"""
-    if category not in EXPENSE_CATEGORIES:
+    if category not in EXPENSE_CATEGORIES_SET:
         raise HTTPException(
             status_code=400,
-            detail=f"Invalid category. Must be one of: {', '.join(EXPENSE_CATEGORIES)}"
-        )
-    
-    expenses = crud.get_expenses_by_category(db=db, category=category)
-    return expenses
-
-@app.get("/expenses/total", response_model=ExpenseTotal, tags=["Expenses"])
-async def get_total_expenses(
-    start_date: Optional[date] = Query(None, description="Filter from date (YYYY-MM-DD)"),
-    end_date: Optional[date] = Query(None, description="Filter to date (YYYY-MM-DD)"),
-    db: Session = Depends(get_db)
-):
-    """Get total expenses and breakdown by category"""
-    try:
-        # Validate date range
-        if start_date and end_date and start_date > end_date:
-            raise HTTPException(
-                status_code=400,
-                detail="start_date must be before or equal to end_date"
-            )
-        
-        total_data = crud.get_total_expenses(
-            db=db,
-            start_date=start_date,
-            end_date=end_date
+            detail=INVALID_CATEGORY_DETAIL
         )
-        
-        return ExpenseTotal(**total_data)
     
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+    expenses = await crud.get_expenses_by_category(db=db, category=category)
+    return [ExpenseResponse.from_orm_trusted(expense) for expense in expenses]
 
 if __name__ == "__main__":
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True) 
\ No newline at end of file
+    asyncio.run(init_database())
+    os.environ[SCHEMA_READY_ENV] = "1"
+    print("Database tables created successfully!")
+    
+    # uvloop + httptools (from uvicorn[standard]). SQLite allows one writer at
+    # a time, so a single worker is the default; set WEB_CONCURRENCY to run
+    # more. Use `uvicorn main:app --reload` for development instead
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+        log_level="warning"
+    ) 
\ No newline at end of file
@@ -1,6 +1,6 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, create_engine
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, Index, event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
 from datetime import datetime
 import os
 
@@ -18,22 +18,125 @@ class Expense(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+# Indexes backing the date-ordered listing and the category/date filters
+Index("ix_expenses_date_desc", Expense.date.desc())
+Index("ix_expenses_category_date", Expense.category, Expense.date.desc())
+
+class CategoryTotal(Base):
+    """Running amount and row count per category, kept in sync by triggers"""
+    __tablename__ = "category_totals"
+    
+    category = Column(String, primary_key=True)
+    total = Column(Float, nullable=False, default=0.0)
+    count = Column(Integer, nullable=False, default=0)
+
+class DailyTotal(Base):
+    """Running amount and row count per day and category, kept in sync by triggers"""
+    __tablename__ = "daily_totals"
+    
+    day = Column(Date, primary_key=True)
+    category = Column(String, primary_key=True)
+    total = Column(Float, nullable=False, default=0.0)
+    count = Column(Integer, nullable=False, default=0)
+
+def _add_to_totals_sql(row: str) -> str:
+    """Trigger statements adding one expense row (NEW or OLD) to the rollups"""
+    return f"""
+        INSERT INTO category_totals (category, total, count)
+        VALUES ({row}.category, {row}.amount, 1)
+        ON CONFLICT (category) DO UPDATE SET total = total + excluded.total, count = count + 1;
+        INSERT INTO daily_totals (day, category, total, count)
+        SELECT date({row}.date), {row}.category, {row}.amount, 1 WHERE {row}.date IS NOT NULL
+        ON CONFLICT (day, category) DO UPDATE SET total = total + excluded.total, count = count + 1;
+    """
+
+def _remove_from_totals_sql(row: str) -> str:
+    """Trigger statements taking one expense row back out of the rollups"""
+    return f"""
+        UPDATE category_totals SET total = total - {row}.amount, count = count - 1
+        WHERE category = {row}.category;
+        DELETE FROM category_totals WHERE category = {row}.category AND count <= 0;
+        UPDATE daily_totals SET total = total - {row}.amount, count = count - 1
+        WHERE day = date({row}.date) AND category = {row}.category;
+        DELETE FROM daily_totals WHERE day = date({row}.date) AND category = {row}.category AND count <= 0;
+    """
+
+# The rollups change in the same statement (and so the same transaction) as
+# the expense rows, whether the write comes from the ORM or a bulk statement
+TOTALS_TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS expenses_totals_insert AFTER INSERT ON expenses
+    BEGIN {_add_to_totals_sql("NEW")} END""",
+    f"""CREATE TRIGGER IF NOT EXISTS expenses_totals_delete AFTER DELETE ON expenses
+    BEGIN {_remove_from_totals_sql("OLD")} END""",
+    f"""CREATE TRIGGER IF NOT EXISTS expenses_totals_update AFTER UPDATE OF amount, category, date ON expenses
+    BEGIN {_remove_from_totals_sql("OLD")} {_add_to_totals_sql("NEW")} END""",
+]
+
+# Trigger names, to skip the DDL on startups where they already exist
+TOTALS_TRIGGER_NAMES = ("expenses_totals_insert", "expenses_totals_delete", "expenses_totals_update")
+
+# Rollups are only backfilled when they are empty but expenses are not,
+# i.e. the rollup tables were just added to an existing database
+ROLLUPS_NEED_BACKFILL = """SELECT EXISTS (SELECT 1 FROM expenses)
+    AND NOT EXISTS (SELECT 1 FROM category_totals)"""
+
+REBUILD_TOTALS = [
+    "DELETE FROM category_totals",
+    """INSERT INTO category_totals (category, total, count)
+    SELECT category, SUM(amount), COUNT(*) FROM expenses GROUP BY category""",
+    "DELETE FROM daily_totals",
+    """INSERT INTO daily_totals (day, category, total, count)
+    SELECT date(date), category, SUM(amount), COUNT(*) FROM expenses
+    WHERE date IS NOT NULL GROUP BY date(date), category""",
+]
+
 # Database setup
-DATABASE_URL = "sqlite:///./expenses.db"
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+DATABASE_URL = "sqlite+aiosqlite:///./expenses.db"
+engine = create_async_engine(
+    DATABASE_URL,
+    pool_size=int(os.getenv("DB_POOL_SIZE", "10")),
+    max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "20")),
+    pool_pre_ping=True,
+    pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "3600"))
+)
+
+@event.listens_for(engine.sync_engine, "connect")
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Enable WAL so readers don't block the writer on pooled connections"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+SessionLocal = async_sessionmaker(
+    bind=engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
 
-def create_tables():
-    """Create all tables in the database"""
-    Base.metadata.create_all(bind=engine)
+async def create_tables(bind: AsyncEngine = engine):
+    """Create all tables, indexes and rollup triggers in the database"""
+    async with bind.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        # create_all skips existing tables entirely, so add any missing indexes
+        for index in Expense.__table__.indexes:
+            await conn.run_sync(index.create, checkfirst=True)
+        
+        # The triggers keep the rollups current in the same transaction as
+        # each write, so both steps below are one-time setup, not per startup
+        existing_triggers = set((await conn.execute(text(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger'"
+        ))).scalars())
+        if not existing_triggers.issuperset(TOTALS_TRIGGER_NAMES):
+            for statement in TOTALS_TRIGGERS:
+                await conn.execute(text(statement))
+        
+        if (await conn.execute(text(ROLLUPS_NEED_BACKFILL))).scalar():
+            for statement in REBUILD_TOTALS:
+                await conn.execute(text(statement))
 
-def get_db():
+async def get_db():
     """Dependency to get database session"""
-    db = SessionLocal()
-    try:
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 # Predefined categories for validation
 EXPENSE_CATEGORIES = [
@@ -52,4 +155,7 @@ EXPENSE_CATEGORIES = [
     "Gifts & Donations",
     "Business",
     "Other"
-] 
\ No newline at end of file
+]
+
+# Set view of the categories for O(1) membership checks
+EXPENSE_CATEGORIES_SET = frozenset(EXPENSE_CATEGORIES)
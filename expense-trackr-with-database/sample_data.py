@@ -1,16 +1,16 @@
+import asyncio
 from datetime import datetime, timedelta
 from models import SessionLocal, create_tables
 from schemas import ExpenseCreate
 import crud
 
-def create_sample_data():
+async def create_sample_data():
     """Create sample expense data for testing"""
-    create_tables()
-    db = SessionLocal()
+    await create_tables()
     
-    try:
+    async with SessionLocal() as db:
         # Check if data already exists
-        existing_expenses = crud.get_expenses(db, limit=1)
+        existing_expenses, *_ = await crud.get_expenses(db, limit=1)
         if existing_expenses:
             print("Sample data already exists. Skipping initialization.")
             return
@@ -124,28 +124,25 @@ def create_sample_data():
             }
         ]
         
-        # Create expenses
-        created_count = 0
+        # Validate expenses, then insert them in one transaction
+        expenses = []
         for expense_data in sample_expenses:
             try:
-                expense = ExpenseCreate(**expense_data)
-                crud.create_expense(db=db, expense=expense)
-                created_count += 1
+                expenses.append(ExpenseCreate(**expense_data))
             except Exception as e:
                 print(f"Error creating expense '{expense_data['title']}': {e}")
         
+        created_count = await crud.create_expenses_bulk(db=db, expenses=expenses)
+        
         print(f"Successfully created {created_count} sample expenses!")
         
         # Print summary
-        total_data = crud.get_total_expenses(db=db)
+        total_data = await crud.get_total_expenses(db=db)
         print(f"Total expenses: ${total_data['total_amount']:.2f}")
         print(f"Total count: {total_data['total_count']}")
         print("Category breakdown:")
         for category, amount in total_data['category_breakdown'].items():
             print(f"  {category}: ${amount:.2f}")
-    
-    finally:
-        db.close()
 
 if __name__ == "__main__":
-    create_sample_data() 
\ No newline at end of file
+    asyncio.run(create_sample_data()) 
\ No newline at end of file
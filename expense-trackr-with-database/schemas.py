@@ -1,7 +1,10 @@
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, computed_field, field_validator
 from datetime import datetime
 from typing import Optional
-from models import EXPENSE_CATEGORIES
+from models import EXPENSE_CATEGORIES, EXPENSE_CATEGORIES_SET
+
+# Built once instead of on every rejected category
+CATEGORY_ERROR = f'Category must be one of: {", ".join(EXPENSE_CATEGORIES)}'
 
 class ExpenseBase(BaseModel):
     title: str = Field(..., min_length=1, max_length=100, description="Expense title")
@@ -10,16 +13,17 @@ class ExpenseBase(BaseModel):
     description: Optional[str] = Field(None, max_length=500, description="Optional description")
     date: Optional[datetime] = Field(None, description="Expense date")
     
-    @validator('category')
+    @field_validator('category')
+    @classmethod
     def validate_category(cls, v):
-        if v not in EXPENSE_CATEGORIES:
-            raise ValueError(f'Category must be one of: {", ".join(EXPENSE_CATEGORIES)}')
+        if v not in EXPENSE_CATEGORIES_SET:
+            raise ValueError(CATEGORY_ERROR)
         return v
     
-    @validator('amount')
+    @field_validator('amount')
+    @classmethod
     def validate_amount(cls, v):
-        if v <= 0:
-            raise ValueError('Amount must be positive')
+        # gt=0 is already enforced by pydantic-core before this runs
         return round(v, 2)
 
 class ExpenseCreate(ExpenseBase):
@@ -32,27 +36,51 @@ class ExpenseUpdate(BaseModel):
     description: Optional[str] = Field(None, max_length=500)
     date: Optional[datetime] = None
     
-    @validator('category')
+    @field_validator('category')
+    @classmethod
     def validate_category(cls, v):
-        if v is not None and v not in EXPENSE_CATEGORIES:
-            raise ValueError(f'Category must be one of: {", ".join(EXPENSE_CATEGORIES)}')
+        if v is not None and v not in EXPENSE_CATEGORIES_SET:
+            raise ValueError(CATEGORY_ERROR)
         return v
     
-    @validator('amount')
+    @field_validator('amount')
+    @classmethod
     def validate_amount(cls, v):
-        if v is not None:
-            if v <= 0:
-                raise ValueError('Amount must be positive')
-            return round(v, 2)
-        return v
+        # gt=0 is already enforced by pydantic-core before this runs
+        return round(v, 2) if v is not None else v
 
 class ExpenseResponse(ExpenseBase):
+    model_config = ConfigDict(from_attributes=True)
+    
     id: int
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
+    @computed_field
+    @property
+    def display_date(self) -> Optional[str]:
+        """Expense date formatted for display (e.g. January 05, 2025)"""
+        return self.date.strftime("%B %d, %Y") if self.date else None
+    
+    @classmethod
+    def from_orm_trusted(cls, obj) -> "ExpenseResponse":
+        """Build a response from a database row without re-running validation"""
+        return cls.model_construct(
+            id=obj.id,
+            title=obj.title,
+            amount=obj.amount,
+            category=obj.category,
+            description=obj.description,
+            date=obj.date,
+            created_at=obj.created_at,
+            updated_at=obj.updated_at
+        )
+
+class ExpenseBulkDelete(BaseModel):
+    ids: list[int] = Field(..., min_length=1, max_length=1000, description="IDs of the expenses to delete")
+
+class ExpenseBulkDeleteResult(BaseModel):
+    deleted: list[int]
 
 class ExpenseTotal(BaseModel):
     total_amount: float
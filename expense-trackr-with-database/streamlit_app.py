@@ -1,13 +1,22 @@
 import streamlit as st
+import orjson
 import requests
-import pandas as pd
-from datetime import datetime, date, timedelta
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from datetime import date, timedelta
 import plotly.express as px
 import plotly.graph_objects as go
 from typing import Optional
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import time
 
 # Configuration
 API_BASE_URL = "http://localhost:8000"
+REQUEST_TIMEOUT = 10  # seconds
+JSON_HEADERS = {"Content-Type": "application/json"}
+EXPENSES_TTL = 30  # seconds; also bounds how long the session copy of the list is reused
 
 # Page configuration
 st.set_page_config(
@@ -65,12 +74,35 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+@st.cache_resource
+def get_http_session() -> requests.Session:
+    """Shared HTTP session so API calls reuse pooled keep-alive connections"""
+    session = requests.Session()
+    # Retry only covers idempotent methods by default, so POSTs are never resent
+    retries = Retry(total=3, backoff_factor=0.1)
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retries)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+@st.cache_resource
+def get_executor() -> ThreadPoolExecutor:
+    """Worker threads for sending independent API calls at the same time"""
+    return ThreadPoolExecutor(max_workers=4)
+
+def fetch_concurrently(*calls):
+    """Run independent API calls in parallel and return their results in order"""
+    get_http_session()  # create the shared session here, on the script thread
+    futures = [get_executor().submit(call) for call in calls]
+    return [future.result() for future in futures]
+
+@st.cache_data(ttl=300, show_spinner=False)
 def get_categories():
-    """Fetch available categories from API"""
+    """Fetch available categories from API (cached; the list rarely changes)"""
     try:
-        response = requests.get(f"{API_BASE_URL}/categories")
+        response = get_http_session().get(f"{API_BASE_URL}/categories", timeout=REQUEST_TIMEOUT)
         if response.status_code == 200:
-            return response.json()
+            return orjson.loads(response.content)
         return []
     except:
         return ["Food & Dining", "Transportation", "Shopping", "Entertainment", 
@@ -81,13 +113,22 @@ def get_categories():
 def create_expense(expense_data):
     """Create a new expense via API"""
     try:
-        response = requests.post(f"{API_BASE_URL}/expenses", json=expense_data)
-        return response.status_code == 200, response.json() if response.status_code == 200 else response.text
+        response = get_http_session().post(
+            f"{API_BASE_URL}/expenses",
+            data=orjson.dumps(expense_data),
+            headers=JSON_HEADERS,
+            timeout=REQUEST_TIMEOUT
+        )
+        if response.status_code == 200:
+            st.cache_data.clear()
+            st.session_state.pop('expenses_cache', None)
+        return response.status_code == 200, orjson.loads(response.content) if response.status_code == 200 else response.text
     except Exception as e:
         return False, str(e)
 
+@st.cache_data(ttl=EXPENSES_TTL, show_spinner=False)
 def get_expenses(category=None, start_date=None, end_date=None, limit=1000):
-    """Fetch expenses from API with optional filters"""
+    """Fetch expenses from API with optional filters (cached per filter set)"""
     try:
         params = {"limit": limit}
         if category:
@@ -97,23 +138,49 @@ def get_expenses(category=None, start_date=None, end_date=None, limit=1000):
         if end_date:
             params["end_date"] = end_date.strftime("%Y-%m-%d")
         
-        response = requests.get(f"{API_BASE_URL}/expenses", params=params)
+        response = get_http_session().get(f"{API_BASE_URL}/expenses", params=params, timeout=REQUEST_TIMEOUT)
         if response.status_code == 200:
-            return response.json()
+            return orjson.loads(response.content)
         return {"expenses": [], "total_count": 0, "filtered_total": 0}
     except:
         return {"expenses": [], "total_count": 0, "filtered_total": 0}
 
-def delete_expense(expense_id):
-    """Delete an expense via API"""
+def delete_expenses(expense_ids):
+    """Delete several expenses via API in a single request"""
     try:
-        response = requests.delete(f"{API_BASE_URL}/expenses/{expense_id}")
+        response = get_http_session().post(
+            f"{API_BASE_URL}/expenses/bulk_delete",
+            data=orjson.dumps({"ids": list(expense_ids)}),
+            headers=JSON_HEADERS,
+            timeout=REQUEST_TIMEOUT
+        )
+        if response.status_code == 200:
+            st.cache_data.clear()
         return response.status_code == 200
     except:
         return False
 
+def delete_selected_expenses(expense_ids):
+    """Button callback: delete the selected rows and drop them from the cached list"""
+    if not delete_expenses(expense_ids):
+        st.error("Failed to delete expenses")
+        return
+    
+    # Patch the cached page in place instead of refetching it from the API
+    deleted_ids = set(expense_ids)
+    cache = st.session_state.expenses_cache
+    removed = [expense for expense in cache['expenses'] if expense['id'] in deleted_ids]
+    cache['expenses'] = [expense for expense in cache['expenses'] if expense['id'] not in deleted_ids]
+    cache['total_count'] -= len(removed)
+    cache['filtered_total'] = round(cache['filtered_total'] - sum(expense['amount'] for expense in removed), 2)
+    
+    for expense_id in expense_ids:
+        st.session_state.pop(f"select_{expense_id}", None)
+    st.success("Expenses deleted!")
+
+@st.cache_data(ttl=30, show_spinner=False)
 def get_total_expenses(start_date=None, end_date=None):
-    """Get total expenses and category breakdown"""
+    """Get total expenses and category breakdown (cached per date range)"""
     try:
         params = {}
         if start_date:
@@ -121,9 +188,9 @@ def get_total_expenses(start_date=None, end_date=None):
         if end_date:
             params["end_date"] = end_date.strftime("%Y-%m-%d")
         
-        response = requests.get(f"{API_BASE_URL}/expenses/total", params=params)
+        response = get_http_session().get(f"{API_BASE_URL}/expenses/total", params=params, timeout=REQUEST_TIMEOUT)
         if response.status_code == 200:
-            return response.json()
+            return orjson.loads(response.content)
         return {"total_amount": 0, "total_count": 0, "category_breakdown": {}}
     except:
         return {"total_amount": 0, "total_count": 0, "category_breakdown": {}}
@@ -132,13 +199,68 @@ def format_currency(amount):
     """Format amount as currency"""
     return f"${amount:,.2f}"
 
-def format_date(date_str):
-    """Format date string for display"""
-    try:
-        dt = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-        return dt.strftime("%B %d, %Y")
-    except:
-        return date_str
+# Chart builders are cached on their (hashable) inputs, so reruns that show
+# the same data reuse the figure instead of rebuilding it with Plotly
+@st.cache_data(max_entries=32, show_spinner=False)
+def build_category_pie(categories: tuple, amounts: tuple) -> go.Figure:
+    """Pie chart of spending share per category"""
+    fig = px.pie(
+        values=list(amounts),
+        names=list(categories),
+        title="Expense Distribution by Category",
+        color_discrete_sequence=px.colors.qualitative.Set3
+    )
+    fig.update_traces(textposition='inside', textinfo='percent+label')
+    return fig
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def build_category_bar(categories: tuple, amounts: tuple) -> go.Figure:
+    """Bar chart of spending per category"""
+    fig = px.bar(
+        x=list(categories),
+        y=list(amounts),
+        title="Spending by Category",
+        labels={"x": "Category", "y": "Amount ($)"},
+        color=list(amounts),
+        color_continuous_scale="viridis"
+    )
+    fig.update_layout(showlegend=False)
+    return fig
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def build_monthly_trend(months: tuple, amounts: tuple) -> go.Figure:
+    """Line chart of spending per month"""
+    fig = px.line(
+        x=list(months),
+        y=list(amounts),
+        title="Monthly Spending Trend",
+        labels={"x": "Month", "y": "Amount ($)"}
+    )
+    fig.update_traces(line_color='#1f77b4', line_width=3)
+    return fig
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def build_top_categories_bar(categories: tuple, amounts: tuple) -> go.Figure:
+    """Horizontal bar chart of the categories with the most spending"""
+    return px.bar(
+        x=list(amounts),
+        y=list(categories),
+        orientation='h',
+        title="Top 10 Categories by Amount",
+        labels={"x": "Amount ($)", "y": "Category"}
+    )
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def build_category_frequency_bar(categories: tuple, counts: tuple) -> go.Figure:
+    """Bar chart of how many expenses each category has"""
+    fig = px.bar(
+        x=list(categories),
+        y=list(counts),
+        title="Expense Frequency by Category",
+        labels={"x": "Category", "y": "Number of Expenses"}
+    )
+    fig.update_layout(xaxis_tickangle=-45)
+    return fig
 
 # Main app
 def main():
@@ -172,8 +294,11 @@ def show_dashboard():
     with col2:
         end_date = st.date_input("End Date", value=date.today())
     
-    # Get total data
-    total_data = get_total_expenses(start_date, end_date)
+    # Get total data and the recent expenses in parallel
+    total_data, recent_expenses_data = fetch_concurrently(
+        partial(get_total_expenses, start_date, end_date),
+        partial(get_expenses, limit=5)
+    )
     
     # Metrics
     col1, col2, col3 = st.columns(3)
@@ -189,36 +314,19 @@ def show_dashboard():
         # Category breakdown chart
         st.subheader("📈 Spending by Category")
         
-        categories = list(total_data["category_breakdown"].keys())
-        amounts = list(total_data["category_breakdown"].values())
+        categories = tuple(total_data["category_breakdown"].keys())
+        amounts = tuple(total_data["category_breakdown"].values())
         
         # Pie chart
-        fig_pie = px.pie(
-            values=amounts,
-            names=categories,
-            title="Expense Distribution by Category",
-            color_discrete_sequence=px.colors.qualitative.Set3
-        )
-        fig_pie.update_traces(textposition='inside', textinfo='percent+label')
-        st.plotly_chart(fig_pie, use_container_width=True)
+        st.plotly_chart(build_category_pie(categories, amounts), use_container_width=True)
         
         # Bar chart
-        fig_bar = px.bar(
-            x=categories,
-            y=amounts,
-            title="Spending by Category",
-            labels={"x": "Category", "y": "Amount ($)"},
-            color=amounts,
-            color_continuous_scale="viridis"
-        )
-        fig_bar.update_layout(showlegend=False)
-        st.plotly_chart(fig_bar, use_container_width=True)
+        st.plotly_chart(build_category_bar(categories, amounts), use_container_width=True)
     
     # Recent expenses
     st.subheader("📝 Recent Expenses")
-    expenses_data = get_expenses(limit=5)
-    if expenses_data["expenses"]:
-        for expense in expenses_data["expenses"]:
+    if recent_expenses_data["expenses"]:
+        for expense in recent_expenses_data["expenses"]:
             with st.container():
                 col1, col2, col3, col4 = st.columns([3, 2, 2, 1])
                 with col1:
@@ -229,7 +337,7 @@ def show_dashboard():
                 with col3:
                     st.write(expense['category'])
                 with col4:
-                    st.write(format_date(expense['date']))
+                    st.write(expense['display_date'])
                 st.divider()
     else:
         st.info("No expenses found. Add some expenses to see them here!")
@@ -295,12 +403,23 @@ def show_view_expenses():
     with col3:
         filter_end_date = st.date_input("To Date", value=None)
     
-    # Get filtered expenses
-    expenses_data = get_expenses(
-        category=filter_category,
-        start_date=filter_start_date,
-        end_date=filter_end_date
-    )
+    # Get filtered expenses; the list is kept in session state so deletes
+    # can patch it without another round trip, but only for as long as the
+    # get_expenses cache would keep it, so other sessions' changes show up
+    filters = (filter_category, filter_start_date, filter_end_date)
+    expenses_data = st.session_state.get('expenses_cache')
+    if (expenses_data is None or expenses_data['filters'] != filters
+            or time.monotonic() - expenses_data['fetched_at'] > EXPENSES_TTL):
+        expenses_data = {
+            **get_expenses(
+                category=filter_category,
+                start_date=filter_start_date,
+                end_date=filter_end_date
+            ),
+            'filters': filters,
+            'fetched_at': time.monotonic()
+        }
+        st.session_state.expenses_cache = expenses_data
     
     # Summary
     st.subheader("📊 Summary")
@@ -320,6 +439,9 @@ def show_view_expenses():
     if expenses_data["expenses"]:
         st.subheader("💳 Expenses")
         
+        # Filled in after the list so it reflects this run's selection
+        action_bar = st.container()
+        
         for expense in expenses_data["expenses"]:
             with st.container():
                 col1, col2, col3, col4, col5 = st.columns([3, 2, 2, 2, 1])
@@ -336,17 +458,26 @@ def show_view_expenses():
                     st.write(f"📁 {expense['category']}")
                 
                 with col4:
-                    st.write(f"📅 {format_date(expense['date'])}")
+                    st.write(f"📅 {expense['display_date']}")
                 
                 with col5:
-                    if st.button("🗑️", key=f"delete_{expense['id']}", help="Delete expense"):
-                        if delete_expense(expense['id']):
-                            st.success("Expense deleted!")
-                            st.rerun()
-                        else:
-                            st.error("Failed to delete expense")
+                    st.checkbox("🗑️", key=f"select_{expense['id']}", help="Select for deletion")
                 
                 st.divider()
+        
+        # Selected rows are deleted together in one request
+        selected_ids = [
+            expense['id'] for expense in expenses_data["expenses"]
+            if st.session_state.get(f"select_{expense['id']}")
+        ]
+        if selected_ids:
+            with action_bar:
+                st.button(
+                    f"🗑️ Delete {len(selected_ids)} selected",
+                    type="primary",
+                    on_click=delete_selected_expenses,
+                    args=(selected_ids,)
+                )
     else:
         st.info("No expenses found matching your filters.")
 
@@ -361,30 +492,36 @@ def show_analytics():
     with col2:
         end_date = st.date_input("Analysis End Date", value=date.today())
     
-    # Get data
-    total_data = get_total_expenses(start_date, end_date)
-    expenses_data = get_expenses(start_date=start_date, end_date=end_date, limit=1000)
+    # Get data (both requests are sent in parallel)
+    total_data, expenses_data = fetch_concurrently(
+        partial(get_total_expenses, start_date, end_date),
+        partial(get_expenses, start_date=start_date, end_date=end_date, limit=1000)
+    )
     
     if not expenses_data["expenses"]:
         st.info("No data available for the selected date range.")
         return
     
-    # Convert to DataFrame for analysis
-    df = pd.DataFrame(expenses_data["expenses"])
-    df['date'] = pd.to_datetime(df['date'])
-    df['month'] = df['date'].dt.to_period('M')
+    # Aggregate everything in one pass over the rows; for the few thousand
+    # rows a request returns this is cheaper than building a DataFrame
+    expenses = expenses_data["expenses"]
+    category_totals = defaultdict(float)
+    category_counts = Counter()
+    monthly_spending = defaultdict(float)
+    for expense in expenses:
+        amount = expense['amount']
+        category_totals[expense['category']] += amount
+        category_counts[expense['category']] += 1
+        monthly_spending[expense['date'][:7]] += amount  # ISO date -> "YYYY-MM"
+    
+    top_categories = sorted(category_totals.items(), key=lambda item: item[1], reverse=True)[:10]
+    frequent_categories = category_counts.most_common(10)
+    months = sorted(monthly_spending)
     
     # Monthly spending trend
     st.subheader("📊 Monthly Spending Trend")
-    monthly_spending = df.groupby('month')['amount'].sum()
     
-    fig_trend = px.line(
-        x=monthly_spending.index.astype(str),
-        y=monthly_spending.values,
-        title="Monthly Spending Trend",
-        labels={"x": "Month", "y": "Amount ($)"}
-    )
-    fig_trend.update_traces(line_color='#1f77b4', line_width=3)
+    fig_trend = build_monthly_trend(tuple(months), tuple(monthly_spending[month] for month in months))
     st.plotly_chart(fig_trend, use_container_width=True)
     
     # Category analysis
@@ -393,26 +530,18 @@ def show_analytics():
     
     with col1:
         # Top categories by amount
-        category_totals = df.groupby('category')['amount'].sum().sort_values(ascending=False)
-        fig_top_cat = px.bar(
-            x=category_totals.head(10).values,
-            y=category_totals.head(10).index,
-            orientation='h',
-            title="Top 10 Categories by Amount",
-            labels={"x": "Amount ($)", "y": "Category"}
+        fig_top_cat = build_top_categories_bar(
+            tuple(category for category, _ in top_categories),
+            tuple(amount for _, amount in top_categories)
         )
         st.plotly_chart(fig_top_cat, use_container_width=True)
     
     with col2:
         # Expense frequency by category
-        category_counts = df['category'].value_counts()
-        fig_freq = px.bar(
-            x=category_counts.head(10).index,
-            y=category_counts.head(10).values,
-            title="Expense Frequency by Category",
-            labels={"x": "Category", "y": "Number of Expenses"}
+        fig_freq = build_category_frequency_bar(
+            tuple(category for category, _ in frequent_categories),
+            tuple(count for _, count in frequent_categories)
         )
-        fig_freq.update_layout(xaxis_tickangle=-45)
         st.plotly_chart(fig_freq, use_container_width=True)
     
     # Insights
@@ -421,15 +550,15 @@ def show_analytics():
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        highest_expense = df.loc[df['amount'].idxmax()]
+        highest_expense = max(expenses, key=lambda expense: expense['amount'])
         st.info(f"**Highest Expense:** {highest_expense['title']} - {format_currency(highest_expense['amount'])}")
     
     with col2:
-        most_frequent_category = df['category'].mode().iloc[0]
+        most_frequent_category = frequent_categories[0][0]
         st.info(f"**Most Frequent Category:** {most_frequent_category}")
     
     with col3:
-        daily_avg = df['amount'].sum() / max((end_date - start_date).days, 1)
+        daily_avg = sum(category_totals.values()) / max((end_date - start_date).days, 1)
         st.info(f"**Daily Average:** {format_currency(daily_avg)}")
 
 if __name__ == "__main__":
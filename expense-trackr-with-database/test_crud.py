@@ -0,0 +1,121 @@
+"""
+Tests for the expense CRUD helpers, run against an in-memory SQLite database
+so they don't touch expenses.db or need the API server running.
+"""
+
+import asyncio
+from datetime import date, datetime
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+import crud
+from models import create_tables
+from schemas import ExpenseCreate, ExpenseUpdate
+
+
+async def _with_session(test):
+    """Run test(db) on a fresh in-memory database set up like the real one"""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    await create_tables(engine)
+    
+    session_factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    try:
+        async with session_factory() as db:
+            await test(db)
+    finally:
+        await engine.dispose()
+
+
+def test_get_expenses_past_the_end():
+    """Paging past the end keeps the real count and total of the filtered set"""
+    async def run(db):
+        await crud.create_expenses_bulk(db, [
+            ExpenseCreate(title="Lunch", amount=12.5, category="Food & Dining", date=datetime(2024, 1, 1)),
+            ExpenseCreate(title="Dinner", amount=30.25, category="Food & Dining", date=datetime(2024, 1, 2)),
+            ExpenseCreate(title="Bus", amount=2.75, category="Transportation", date=datetime(2024, 1, 3)),
+        ])
+        
+        expenses, total_count, filtered_total, last_updated = await crud.get_expenses(db, skip=0, limit=1)
+        assert len(expenses) == 1
+        assert (total_count, filtered_total) == (3, 45.5)
+        
+        expenses, total_count, filtered_total, last_updated = await crud.get_expenses(db, skip=10, limit=5)
+        assert expenses == []
+        assert (total_count, filtered_total) == (3, 45.5)
+        assert last_updated is not None
+        
+        expenses, total_count, filtered_total, _ = await crud.get_expenses(
+            db, skip=5, limit=5, category="Food & Dining"
+        )
+        assert expenses == []
+        assert (total_count, filtered_total) == (2, 42.75)
+        
+        expenses, total_count, filtered_total, last_updated = await crud.get_expenses(
+            db, skip=5, limit=5, category="Travel"
+        )
+        assert (expenses, total_count, filtered_total, last_updated) == ([], 0, 0.0, None)
+    
+    asyncio.run(_with_session(run))
+
+
+
+def test_totals_follow_writes():
+    """The trigger-maintained rollups track inserts, updates and deletes"""
+    async def run(db):
+        january = (date(2024, 1, 1), date(2024, 1, 31))
+        
+        async def totals():
+            return (
+                await crud.get_total_expenses(db),
+                await crud.get_total_expenses(db, *january)
+            )
+        
+        await crud.create_expenses_bulk(db, [
+            ExpenseCreate(title="Lunch", amount=12.5, category="Food & Dining", date=datetime(2024, 1, 5, 12)),
+            ExpenseCreate(title="Train", amount=40.0, category="Travel", date=datetime(2024, 2, 1, 9)),
+        ])
+        bus = await crud.create_expense(db, ExpenseCreate(
+            title="Bus", amount=2.75, category="Transportation", date=datetime(2024, 1, 10, 8)
+        ))
+        all_time, in_january = await totals()
+        assert all_time == {
+            "total_amount": 55.25,
+            "total_count": 3,
+            "category_breakdown": {"Food & Dining": 12.5, "Transportation": 2.75, "Travel": 40.0}
+        }
+        assert in_january == {
+            "total_amount": 15.25,
+            "total_count": 2,
+            "category_breakdown": {"Food & Dining": 12.5, "Transportation": 2.75}
+        }
+        
+        # Moving the bus fare to another amount, category and month
+        await crud.update_expense(db, bus.id, ExpenseUpdate(
+            amount=3.5, category="Other", date=datetime(2024, 2, 2, 8)
+        ))
+        all_time, in_january = await totals()
+        assert all_time == {
+            "total_amount": 56.0,
+            "total_count": 3,
+            "category_breakdown": {"Food & Dining": 12.5, "Other": 3.5, "Travel": 40.0}
+        }
+        assert in_january == {
+            "total_amount": 12.5,
+            "total_count": 1,
+            "category_breakdown": {"Food & Dining": 12.5}
+        }
+        
+        assert await crud.delete_expense(db, bus.id)
+        all_time, in_january = await totals()
+        assert all_time["category_breakdown"] == {"Food & Dining": 12.5, "Travel": 40.0}
+        assert (all_time["total_amount"], all_time["total_count"]) == (52.5, 2)
+        assert in_january["category_breakdown"] == {"Food & Dining": 12.5}
+        
+        expenses, _, _, _ = await crud.get_expenses(db)
+        assert await crud.delete_expenses_bulk(db, [expense.id for expense in expenses]) == sorted(
+            expense.id for expense in expenses
+        )
+        empty = {"total_amount": 0.0, "total_count": 0, "category_breakdown": {}}
+        assert await totals() == (empty, empty)
+    
+    asyncio.run(_with_session(run))
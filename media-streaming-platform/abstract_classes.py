@@ -1,20 +1,26 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set, Tuple
 from enum import Enum
-import statistics
 
 
 class ContentRating(Enum):
-    G = "G"
-    PG = "PG"
-    PG13 = "PG-13"
-    R = "R"
-    NC17 = "NC-17"
-    TV_Y = "TV-Y"
-    TV_G = "TV-G"
-    TV_PG = "TV-PG"
-    TV_14 = "TV-14"
-    TV_MA = "TV-MA"
+    # (display value, restriction level); film and TV ratings share levels
+    G = ("G", 0)
+    PG = ("PG", 1)
+    PG13 = ("PG-13", 2)
+    R = ("R", 3)
+    NC17 = ("NC-17", 4)
+    TV_Y = ("TV-Y", 0)
+    TV_G = ("TV-G", 1)
+    TV_PG = ("TV-PG", 2)
+    TV_14 = ("TV-14", 3)
+    TV_MA = ("TV-MA", 4)
+    
+    def __new__(cls, label: str, level: int):
+        member = object.__new__(cls)
+        member._value_ = label
+        member.level = level
+        return member
 
 
 class SubscriptionTier(Enum):
@@ -23,9 +29,22 @@ class SubscriptionTier(Enum):
     FAMILY = "family"
 
 
+# Capability flags for optional content attributes, so devices can test
+# content.capability_flags instead of probing with hasattr()
+CAP_RESOLUTION = 1  # has a video resolution (Movie)
+CAP_ARTIST = 2      # has an artist (Music)
+CAP_HOST = 4        # has a host (Podcast)
+
+
 class MediaContent(ABC):
     """Abstract base class for all media content types."""
     
+    capability_flags = 0
+    
+    __slots__ = ('title', 'content_id', 'description', 'release_date', 'rating',
+                 'is_premium', 'user_ratings', 'view_count', 'tags', '_tag_set',
+                 '_rating_sum', '_rating_count')
+    
     def __init__(self, title: str, content_id: str, description: str, 
                  release_date: str, rating: ContentRating, is_premium: bool = False):
         self.title = title
@@ -37,6 +56,10 @@ class MediaContent(ABC):
         self.user_ratings: List[float] = []
         self.view_count = 0
         self.tags: List[str] = []
+        self._tag_set: Set[str] = set()  # mirrors tags for O(1) duplicate checks
+        # Running totals so the average is O(1) instead of a pass over user_ratings
+        self._rating_sum = 0.0
+        self._rating_count = 0
     
     @abstractmethod
     def play(self) -> str:
@@ -62,14 +85,24 @@ class MediaContent(ABC):
         """Add a user rating (1-5 stars)."""
         if 1 <= rating <= 5:
             self.user_ratings.append(rating)
+            self._rating_sum += rating
+            self._rating_count += 1
         else:
             raise ValueError("Rating must be between 1 and 5")
     
+    def add_ratings(self, ratings: List[float]) -> None:
+        """Add several user ratings at once (all or nothing)."""
+        if not all(1 <= rating <= 5 for rating in ratings):
+            raise ValueError("Rating must be between 1 and 5")
+        self.user_ratings.extend(ratings)
+        self._rating_sum += sum(ratings)
+        self._rating_count += len(ratings)
+    
     def get_average_rating(self) -> Optional[float]:
         """Get average user rating."""
-        if not self.user_ratings:
+        if not self._rating_count:
             return None
-        return round(statistics.mean(self.user_ratings), 2)
+        return round(self._rating_sum / self._rating_count, 2)
     
     def is_premium_content(self) -> bool:
         """Check if content requires premium subscription."""
@@ -81,20 +114,27 @@ class MediaContent(ABC):
     
     def add_tag(self, tag: str) -> None:
         """Add a tag to the content."""
-        if tag not in self.tags:
+        if tag not in self._tag_set:
+            self._tag_set.add(tag)
             self.tags.append(tag)
 
 
 class StreamingDevice(ABC):
     """Abstract base class for different streaming devices."""
     
+    # Device key for MediaContent.calculate_streaming_cost, set by each subclass
+    device_type = ""
+    
+    __slots__ = ('device_id', 'device_name', 'max_resolution', 'is_connected',
+                 'current_content', 'supported_formats', 'current_quality')
+    
     def __init__(self, device_id: str, device_name: str, max_resolution: str):
         self.device_id = device_id
         self.device_name = device_name
         self.max_resolution = max_resolution
         self.is_connected = False
         self.current_content: Optional[MediaContent] = None
-        self.supported_formats: List[str] = []
+        self.supported_formats: Tuple[str, ...] = ()
         self.current_quality = "auto"
     
     @abstractmethod
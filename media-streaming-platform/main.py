@@ -23,12 +23,26 @@ from media_content import Movie, TVShow, Podcast, Music
 from streaming_devices import SmartTV, Laptop, Mobile, SmartSpeaker
 from user import User
 from streaming_platform import StreamingPlatform
-import time
+from datetime import datetime, timedelta
+from typing import Optional
 import random
 
 
-def create_sample_content():
-    """Create sample content for the platform."""
+class DemoClock:
+    """Clock for the demo that only moves forward when told to."""
+    
+    def __init__(self):
+        self.now = datetime.now()
+    
+    def __call__(self) -> datetime:
+        return self.now
+    
+    def advance(self, minutes: int) -> None:
+        self.now += timedelta(minutes=minutes)
+
+
+def create_sample_content(seed: Optional[int] = None):
+    """Create sample content for the platform (pass a seed for repeatable ratings and views)."""
     content = []
     
     # Movies
@@ -84,11 +98,12 @@ def create_sample_content():
     content.extend(podcasts)
     content.extend(music)
     
-    # Add some ratings to content
+    # Add some ratings to content from one generator instead of the shared module state
+    rng = random.Random(seed)
+    uniform, randint = rng.uniform, rng.randint
     for item in content:
-        for _ in range(random.randint(10, 50)):
-            item.add_rating(random.uniform(3.0, 5.0))
-        item.view_count = random.randint(100, 10000)
+        item.add_ratings([uniform(3.0, 5.0) for _ in range(randint(10, 50))])
+        item.view_count = randint(100, 10000)
     
     return content
 
@@ -182,14 +197,13 @@ def demonstrate_polymorphism(platform):
     print(f"Speaker: {speaker.adjust_quality('lossless')}")
 
 
-def demonstrate_streaming_workflow(platform):
+def demonstrate_streaming_workflow(platform, user):
     """Demonstrate complete streaming workflow."""
     print("\n" + "="*60)
     print("🎥 COMPLETE STREAMING WORKFLOW")
     print("="*60)
     
-    user_id = "user_001"
-    user = platform.authenticate_user(user_id)
+    user_id = user.user_id
     
     print(f"\n👤 User: {user.username} ({user.subscription_tier.value} subscription)")
     
@@ -202,7 +216,7 @@ def demonstrate_streaming_workflow(platform):
     
     # Simulate some viewing time
     print("\n⏱️ Simulating 5 minutes of viewing...")
-    time.sleep(2)  # Simulate time passing
+    platform.clock.advance(minutes=5)  # Simulate time passing without waiting
     
     # Check active stream
     dashboard = platform.get_user_dashboard(user_id)
@@ -224,14 +238,13 @@ def demonstrate_streaming_workflow(platform):
     print(f"📝 Adding to watchlist: {user.add_to_watchlist('tv_001')}")
 
 
-def demonstrate_recommendation_engine(platform):
+def demonstrate_recommendation_engine(platform, user):
     """Demonstrate the recommendation engine."""
     print("\n" + "="*60)
     print("🤖 RECOMMENDATION ENGINE")
     print("="*60)
     
-    user_id = "user_001"
-    user = platform.authenticate_user(user_id)
+    user_id = user.user_id
     
     # Simulate some viewing history
     user.add_to_watch_history(platform.get_content_by_id("mov_001"), 120, "tv_001", "4K")
@@ -243,10 +256,10 @@ def demonstrate_recommendation_engine(platform):
     print(f"   Preferred genres: {list(user.preferences.preferred_genres)}")
     print(f"   Subscription tier: {user.subscription_tier.value}")
     
-    recommendations = platform.get_recommendations(user_id)
+    recommendations = platform.get_recommendations(user_id, limit=5)
     
     print(f"\n🎯 Top 5 Recommendations:")
-    for i, rec in enumerate(recommendations[:5], 1):
+    for i, rec in enumerate(recommendations, 1):
         rating_str = f"⭐ {rec['rating']}" if rec['rating'] else "⭐ No rating"
         premium_str = "💎 Premium" if rec['is_premium'] else "🆓 Free"
         print(f"  {i}. {rec['title']} ({rec['type']})")
@@ -297,7 +310,7 @@ def demonstrate_parental_controls(platform):
         print(f"📱 Daily Time Limit: {hours}h {minutes}m")
 
 
-def demonstrate_analytics(platform):
+def demonstrate_analytics(platform, user):
     """Demonstrate analytics and reporting features."""
     print("\n" + "="*60)
     print("📊 ANALYTICS & REPORTING")
@@ -322,7 +335,6 @@ def demonstrate_analytics(platform):
         print(f"   • {device_type}: {count}")
     
     # User-specific analytics
-    user = platform.authenticate_user("user_001")
     user_stats = user.get_watch_analytics()
     
     print(f"\n👤 User Analytics for '{user.username}':")
@@ -375,7 +387,7 @@ def main():
     print("🎬" + "="*58 + "🎬")
     
     # Initialize the platform
-    platform = StreamingPlatform("StreamFlix Pro")
+    platform = StreamingPlatform("StreamFlix Pro", clock=DemoClock())
     
     # Setup sample data
     print("\n🔧 Setting up platform...")
@@ -400,13 +412,14 @@ def main():
     print(f"   📱 Registered {len(devices)} devices")
     print(f"   👥 Registered {len(users)} users")
     
-    # Run demonstrations
+    # Run demonstrations (the main demo user is looked up once and shared)
+    alice = platform.authenticate_user("user_001")
     demonstrate_polymorphism(platform)
-    demonstrate_streaming_workflow(platform)
-    demonstrate_recommendation_engine(platform)
+    demonstrate_streaming_workflow(platform, alice)
+    demonstrate_recommendation_engine(platform, alice)
     demonstrate_parental_controls(platform)
     demonstrate_search_functionality(platform)
-    demonstrate_analytics(platform)
+    demonstrate_analytics(platform, alice)
     
     print("\n" + "="*60)
     print("🎉 DEMONSTRATION COMPLETE!")
@@ -1,11 +1,27 @@
-from abstract_classes import MediaContent, ContentRating
-from typing import List, Optional, Dict, Any
+from abstract_classes import MediaContent, ContentRating, CAP_RESOLUTION, CAP_ARTIST, CAP_HOST
+from typing import Optional, Dict, Any
 import random
 
 
+# Streaming-cost multipliers, built once instead of on every cost calculation
+_VIDEO_Q_MULT = {"720p": 1.0, "1080p": 1.5, "4K": 2.5, "8K": 4.0}
+_TV_Q_MULT = {"720p": 1.0, "1080p": 1.5, "4K": 2.0}
+_MUSIC_Q_MULT = {"low": 0.5, "standard": 1.0, "high": 1.5, "lossless": 2.0}
+_DEVICE_MULT = {"mobile": 0.8, "laptop": 1.0, "smart_tv": 1.2, "smart_speaker": 0.5}
+_PODCAST_DEVICE_MULT = {"mobile": 0.9, "laptop": 1.0, "smart_tv": 0.7, "smart_speaker": 1.2}
+_MUSIC_DEVICE_MULT = {"mobile": 1.0, "laptop": 1.0, "smart_tv": 0.8, "smart_speaker": 1.3}
+
+# Movie file size in GB per minute, by resolution
+_MOVIE_SIZE_PER_MIN = {"720p": 0.02, "1080p": 0.05, "4K": 0.15, "8K": 0.4}
+
+
 class Movie(MediaContent):
     """Concrete class for movie content."""
     
+    capability_flags = CAP_RESOLUTION
+    __slots__ = ('duration_minutes', 'resolution', 'genre', 'director', 'cast',
+                 'subtitles_available')
+    
     def __init__(self, title: str, content_id: str, description: str, 
                  release_date: str, rating: ContentRating, duration_minutes: int,
                  resolution: str, genre: str, director: str, is_premium: bool = False):
@@ -14,8 +30,8 @@ class Movie(MediaContent):
         self.resolution = resolution
         self.genre = genre
         self.director = director
-        self.cast: List[str] = []
-        self.subtitles_available: List[str] = ["English"]
+        self.cast: Dict[str, None] = {}  # insertion-ordered set
+        self.subtitles_available: Dict[str, None] = {"English": None}
         
     def play(self) -> str:
         """Start playing the movie."""
@@ -28,38 +44,31 @@ class Movie(MediaContent):
     
     def get_file_size(self) -> float:
         """Calculate file size based on duration and resolution."""
-        base_size_per_minute = {
-            "720p": 0.02,  # GB per minute
-            "1080p": 0.05,
-            "4K": 0.15,
-            "8K": 0.4
-        }
-        return round(self.duration_minutes * base_size_per_minute.get(self.resolution, 0.05), 2)
+        return round(self.duration_minutes * _MOVIE_SIZE_PER_MIN.get(self.resolution, 0.05), 2)
     
     def calculate_streaming_cost(self, device_type: str, quality: str) -> float:
         """Calculate streaming cost based on device and quality."""
         base_cost = 0.05  # Base cost per minute
-        quality_multiplier = {"720p": 1.0, "1080p": 1.5, "4K": 2.5, "8K": 4.0}
-        device_multiplier = {"mobile": 0.8, "laptop": 1.0, "smart_tv": 1.2, "smart_speaker": 0.5}
-        
         return round(base_cost * self.duration_minutes * 
-                    quality_multiplier.get(quality, 1.0) * 
-                    device_multiplier.get(device_type, 1.0), 2)
+                    _VIDEO_Q_MULT.get(quality, 1.0) * 
+                    _DEVICE_MULT.get(device_type, 1.0), 2)
     
     def add_cast_member(self, actor: str) -> None:
         """Add an actor to the cast."""
-        if actor not in self.cast:
-            self.cast.append(actor)
+        self.cast[actor] = None
     
     def add_subtitle_language(self, language: str) -> None:
         """Add subtitle language support."""
-        if language not in self.subtitles_available:
-            self.subtitles_available.append(language)
+        self.subtitles_available[language] = None
 
 
 class TVShow(MediaContent):
     """Concrete class for TV show content."""
     
+    __slots__ = ('total_episodes', 'total_seasons', 'episode_duration', 'genre',
+                 'current_season', 'current_episode', 'episodes_watched',
+                 'is_series_complete')
+    
     def __init__(self, title: str, content_id: str, description: str, 
                  release_date: str, rating: ContentRating, total_episodes: int,
                  total_seasons: int, episode_duration: int, genre: str,
@@ -92,12 +101,9 @@ class TVShow(MediaContent):
     def calculate_streaming_cost(self, device_type: str, quality: str) -> float:
         """Calculate streaming cost for current episode."""
         base_cost = 0.03  # Base cost per minute for TV
-        quality_multiplier = {"720p": 1.0, "1080p": 1.5, "4K": 2.0}
-        device_multiplier = {"mobile": 0.8, "laptop": 1.0, "smart_tv": 1.2, "smart_speaker": 0.5}
-        
         return round(base_cost * self.episode_duration * 
-                    quality_multiplier.get(quality, 1.0) * 
-                    device_multiplier.get(device_type, 1.0), 2)
+                    _TV_Q_MULT.get(quality, 1.0) * 
+                    _DEVICE_MULT.get(device_type, 1.0), 2)
     
     def next_episode(self) -> str:
         """Move to the next episode."""
@@ -124,6 +130,10 @@ class TVShow(MediaContent):
 class Podcast(MediaContent):
     """Concrete class for podcast content."""
     
+    capability_flags = CAP_HOST
+    __slots__ = ('episode_number', 'duration_minutes', 'host', 'transcript_available',
+                 'guests', 'topics')
+    
     def __init__(self, title: str, content_id: str, description: str, 
                  release_date: str, episode_number: int, duration_minutes: int,
                  host: str, transcript_available: bool = False, is_premium: bool = False):
@@ -132,8 +142,8 @@ class Podcast(MediaContent):
         self.duration_minutes = duration_minutes
         self.host = host
         self.transcript_available = transcript_available
-        self.guests: List[str] = []
-        self.topics: List[str] = []
+        self.guests: Dict[str, None] = {}  # insertion-ordered sets
+        self.topics: Dict[str, None] = {}
         
     def play(self) -> str:
         """Start playing the podcast."""
@@ -155,20 +165,16 @@ class Podcast(MediaContent):
     def calculate_streaming_cost(self, device_type: str, quality: str) -> float:
         """Calculate streaming cost for podcast."""
         base_cost = 0.01  # Lower cost for audio content
-        device_multiplier = {"mobile": 0.9, "laptop": 1.0, "smart_tv": 0.7, "smart_speaker": 1.2}
-        
         return round(base_cost * self.duration_minutes * 
-                    device_multiplier.get(device_type, 1.0), 2)
+                    _PODCAST_DEVICE_MULT.get(device_type, 1.0), 2)
     
     def add_guest(self, guest: str) -> None:
         """Add a guest to the podcast."""
-        if guest not in self.guests:
-            self.guests.append(guest)
+        self.guests[guest] = None
     
     def add_topic(self, topic: str) -> None:
         """Add a topic discussed in the podcast."""
-        if topic not in self.topics:
-            self.topics.append(topic)
+        self.topics[topic] = None
     
     def get_transcript(self) -> str:
         """Get transcript if available."""
@@ -180,6 +186,10 @@ class Podcast(MediaContent):
 class Music(MediaContent):
     """Concrete class for music content."""
     
+    capability_flags = CAP_ARTIST
+    __slots__ = ('artist', 'album', 'duration_seconds', 'genre', 'lyrics_available',
+                 'featured_artists', 'play_count', '_duration_str')
+    
     def __init__(self, title: str, content_id: str, description: str, 
                  release_date: str, artist: str, album: str, duration_seconds: int,
                  genre: str, lyrics_available: bool = False, is_premium: bool = False):
@@ -187,18 +197,18 @@ class Music(MediaContent):
         self.artist = artist
         self.album = album
         self.duration_seconds = duration_seconds
+        self._duration_str = f"{duration_seconds // 60}:{duration_seconds % 60:02d}"  # "M:SS" for play()
         self.genre = genre
         self.lyrics_available = lyrics_available
-        self.featured_artists: List[str] = []
+        self.featured_artists: Dict[str, None] = {}  # insertion-ordered set
         self.play_count = 0
         
     def play(self) -> str:
         """Start playing the music."""
         self.increment_view_count()
         self.play_count += 1
-        duration_str = f"{self.duration_seconds // 60}:{self.duration_seconds % 60:02d}"
         lyrics_info = " 🎵" if self.lyrics_available else ""
-        return f"🎵 Now playing: {self.title} by {self.artist} ({duration_str}){lyrics_info}"
+        return f"🎵 Now playing: {self.title} by {self.artist} ({self._duration_str}){lyrics_info}"
     
     def get_duration(self) -> int:
         """Get music duration in minutes."""
@@ -213,18 +223,14 @@ class Music(MediaContent):
     def calculate_streaming_cost(self, device_type: str, quality: str) -> float:
         """Calculate streaming cost for music."""
         base_cost = 0.005  # Very low cost for music streaming
-        quality_multiplier = {"low": 0.5, "standard": 1.0, "high": 1.5, "lossless": 2.0}
-        device_multiplier = {"mobile": 1.0, "laptop": 1.0, "smart_tv": 0.8, "smart_speaker": 1.3}
-        
         duration_minutes = self.duration_seconds / 60
         return round(base_cost * duration_minutes * 
-                    quality_multiplier.get(quality, 1.0) * 
-                    device_multiplier.get(device_type, 1.0), 3)
+                    _MUSIC_Q_MULT.get(quality, 1.0) * 
+                    _MUSIC_DEVICE_MULT.get(device_type, 1.0), 3)
     
     def add_featured_artist(self, artist: str) -> None:
         """Add a featured artist."""
-        if artist not in self.featured_artists:
-            self.featured_artists.append(artist)
+        self.featured_artists[artist] = None
     
     def get_lyrics(self) -> str:
         """Get lyrics if available."""
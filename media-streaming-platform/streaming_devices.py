@@ -1,17 +1,32 @@
-from abstract_classes import StreamingDevice, MediaContent
+from abstract_classes import StreamingDevice, MediaContent, CAP_RESOLUTION, CAP_ARTIST, CAP_HOST
 from typing import List, Dict, Any, Optional
 import random
 
 
+def _clamp_percent(value: int) -> int:
+    """Clamp a percentage setting to the 0-100 range."""
+    return 0 if value < 0 else (100 if value > 100 else value)
+
+
+# Resolutions ordered from lowest to highest, for picking the lower of two
+_RANK_RES = ("480p", "720p", "1080p", "4K", "8K")
+_RES_RANK = {resolution: rank for rank, resolution in enumerate(_RANK_RES)}
+
+
 class SmartTV(StreamingDevice):
     """Smart TV streaming device with large screen and 4K support."""
     
+    device_type = "smart_tv"
+    _QUALITIES = frozenset(("720p", "1080p", "4K", "8K"))
+    _QUALITIES_STR = "720p, 1080p, 4K, 8K"
+    __slots__ = ('screen_size', 'has_surround_sound', 'volume_level', 'brightness')
+    
     def __init__(self, device_id: str, device_name: str, screen_size: float, 
                  has_surround_sound: bool = True):
         super().__init__(device_id, device_name, "4K")
         self.screen_size = screen_size  # in inches
         self.has_surround_sound = has_surround_sound
-        self.supported_formats = ["MP4", "AVI", "MKV", "HEVC", "HDR10"]
+        self.supported_formats = ("MP4", "AVI", "MKV", "HEVC", "HDR10")
         self.current_quality = "4K"
         self.volume_level = 50
         self.brightness = 75
@@ -28,8 +43,9 @@ class SmartTV(StreamingDevice):
         
         self.current_content = content
         # Optimize for TV viewing
-        if hasattr(content, 'resolution'):
-            optimal_quality = min(content.resolution, self.max_resolution)
+        if content.capability_flags & CAP_RESOLUTION:
+            optimal_quality = _RANK_RES[min(_RES_RANK.get(content.resolution, 2),
+                                            _RES_RANK[self.max_resolution])]
         else:
             optimal_quality = "1080p"  # Default for audio content
             
@@ -38,23 +54,22 @@ class SmartTV(StreamingDevice):
     
     def adjust_quality(self, quality: str) -> str:
         """Adjust streaming quality for Smart TV."""
-        available_qualities = ["720p", "1080p", "4K", "8K"]
-        if quality in available_qualities:
+        if quality in self._QUALITIES:
             self.current_quality = quality
             return f"Quality adjusted to {quality} on {self.device_name}"
-        return f"Quality {quality} not supported. Available: {', '.join(available_qualities)}"
+        return f"Quality {quality} not supported. Available: {self._QUALITIES_STR}"
     
     def check_compatibility(self, content: MediaContent) -> bool:
         """Check Smart TV compatibility with content."""
         # Smart TVs can handle most content types
-        if hasattr(content, 'resolution'):
-            return content.resolution in ["720p", "1080p", "4K", "8K"]
+        if content.capability_flags & CAP_RESOLUTION:
+            return content.resolution in self._QUALITIES
         return True  # Audio content is always compatible
     
     def adjust_display_settings(self, brightness: int, volume: int) -> str:
         """Adjust TV display and audio settings."""
-        self.brightness = max(0, min(100, brightness))
-        self.volume_level = max(0, min(100, volume))
+        self.brightness = _clamp_percent(brightness)
+        self.volume_level = _clamp_percent(volume)
         return f"Display settings updated: Brightness {self.brightness}%, Volume {self.volume_level}%"
     
     def enable_parental_controls(self, max_rating: str) -> str:
@@ -65,13 +80,18 @@ class SmartTV(StreamingDevice):
 class Laptop(StreamingDevice):
     """Laptop streaming device with medium screen and headphone support."""
     
+    device_type = "laptop"
+    _QUALITIES = frozenset(("480p", "720p", "1080p"))
+    _QUALITIES_STR = "480p, 720p, 1080p"
+    __slots__ = ('screen_size', 'has_headphone_jack', 'battery_level', 'is_power_saving')
+    
     def __init__(self, device_id: str, device_name: str, screen_size: float,
                  has_headphone_jack: bool = True, battery_level: int = 100):
         super().__init__(device_id, device_name, "1080p")
         self.screen_size = screen_size  # in inches
         self.has_headphone_jack = has_headphone_jack
         self.battery_level = battery_level
-        self.supported_formats = ["MP4", "AVI", "MKV", "WebM"]
+        self.supported_formats = ("MP4", "AVI", "MKV", "WebM")
         self.current_quality = "1080p"
         self.is_power_saving = False
         
@@ -97,22 +117,20 @@ class Laptop(StreamingDevice):
     
     def adjust_quality(self, quality: str) -> str:
         """Adjust streaming quality for laptop."""
-        available_qualities = ["480p", "720p", "1080p"]
-        if quality in available_qualities:
+        if quality in self._QUALITIES:
             self.current_quality = quality
             # Higher quality drains battery faster
             if quality == "1080p" and self.battery_level < 30:
                 return f"Warning: {quality} will drain battery quickly. Current battery: {self.battery_level}%"
             return f"Quality adjusted to {quality} on {self.device_name}"
-        return f"Quality {quality} not supported. Available: {', '.join(available_qualities)}"
+        return f"Quality {quality} not supported. Available: {self._QUALITIES_STR}"
     
     def check_compatibility(self, content: MediaContent) -> bool:
         """Check laptop compatibility with content."""
         # Laptops are versatile but limited by battery and processing power
-        if hasattr(content, 'get_file_size'):
-            file_size = content.get_file_size()
-            if file_size > 5.0:  # GB
-                return self.battery_level > 50  # Large files need good battery
+        file_size = content.get_file_size()
+        if file_size > 5.0:  # GB
+            return self.battery_level > 50  # Large files need good battery
         return True
     
     def toggle_power_saving(self) -> str:
@@ -125,7 +143,7 @@ class Laptop(StreamingDevice):
     
     def update_battery_level(self, level: int) -> str:
         """Update battery level."""
-        self.battery_level = max(0, min(100, level))
+        self.battery_level = _clamp_percent(level)
         if self.battery_level < 10:
             return f"⚠️ Critical battery level: {self.battery_level}%. Please charge device."
         return f"Battery level: {self.battery_level}%"
@@ -134,6 +152,12 @@ class Laptop(StreamingDevice):
 class Mobile(StreamingDevice):
     """Mobile device with small screen and battery optimization."""
     
+    device_type = "mobile"
+    _QUALITIES = frozenset(("480p", "720p", "1080p"))
+    _QUALITIES_STR = "480p, 720p, 1080p"
+    __slots__ = ('screen_size', 'os_type', 'data_plan_limit', 'data_used',
+                 'is_wifi_connected', 'battery_optimization')
+    
     def __init__(self, device_id: str, device_name: str, screen_size: float,
                  os_type: str, data_plan_limit: float = 10.0):  # GB
         super().__init__(device_id, device_name, "1080p")
@@ -141,7 +165,7 @@ class Mobile(StreamingDevice):
         self.os_type = os_type  # iOS, Android, etc.
         self.data_plan_limit = data_plan_limit
         self.data_used = 0.0
-        self.supported_formats = ["MP4", "WebM", "HLS"]
+        self.supported_formats = ("MP4", "WebM", "HLS")
         self.current_quality = "720p"  # Default to save data
         self.is_wifi_connected = False
         self.battery_optimization = True
@@ -173,23 +197,21 @@ class Mobile(StreamingDevice):
     
     def adjust_quality(self, quality: str) -> str:
         """Adjust streaming quality for mobile device."""
-        available_qualities = ["480p", "720p", "1080p"]
-        if quality in available_qualities:
+        if quality in self._QUALITIES:
             self.current_quality = quality
             
             # Data usage warning for higher quality
-            if not self.is_wifi_connected and quality in ["1080p"]:
+            if not self.is_wifi_connected and quality == "1080p":
                 return f"⚠️ {quality} will use significant mobile data. Consider switching to Wi-Fi."
             return f"Quality adjusted to {quality} on {self.device_name}"
-        return f"Quality {quality} not supported. Available: {', '.join(available_qualities)}"
+        return f"Quality {quality} not supported. Available: {self._QUALITIES_STR}"
     
     def check_compatibility(self, content: MediaContent) -> bool:
         """Check mobile compatibility with content."""
         # Mobile devices prefer smaller file sizes and shorter content
-        if hasattr(content, 'get_duration'):
-            duration = content.get_duration()
-            if duration > 180:  # 3 hours
-                return self.is_wifi_connected  # Long content needs Wi-Fi
+        duration = content.get_duration()
+        if duration > 180:  # 3 hours
+            return self.is_wifi_connected  # Long content needs Wi-Fi
         return True
     
     def set_wifi_status(self, wifi_connected: bool) -> str:
@@ -215,15 +237,27 @@ class Mobile(StreamingDevice):
         return f"Data usage: {self.data_used:.2f}GB/{self.data_plan_limit}GB"
 
 
+_SPEAKER_QUALITY_DESC = {
+    "standard": "Good quality, lower bandwidth",
+    "high": "High quality audio",
+    "lossless": "Premium lossless audio"
+}
+
+
 class SmartSpeaker(StreamingDevice):
     """Smart speaker device for audio-only content with voice control."""
     
+    device_type = "smart_speaker"
+    _QUALITIES_STR = "standard, high, lossless"
+    __slots__ = ('speaker_quality', 'voice_assistant', 'volume_level',
+                 'voice_control_enabled')
+    
     def __init__(self, device_id: str, device_name: str, speaker_quality: str,
                  voice_assistant: str = "Generic"):
         super().__init__(device_id, device_name, "Audio Only")
         self.speaker_quality = speaker_quality  # Basic, Premium, High-End
         self.voice_assistant = voice_assistant
-        self.supported_formats = ["MP3", "AAC", "FLAC", "OGG"]
+        self.supported_formats = ("MP3", "AAC", "FLAC", "OGG")
         self.current_quality = "high"
         self.volume_level = 50
         self.voice_control_enabled = True
@@ -242,7 +276,7 @@ class SmartSpeaker(StreamingDevice):
         voice_info = f" Say 'Hey {self.voice_assistant}, pause' to control." if self.voice_control_enabled else ""
         
         # Smart speakers only handle audio content well
-        if hasattr(content, 'artist') or hasattr(content, 'host'):
+        if content.capability_flags & (CAP_ARTIST | CAP_HOST):
             return f"🔊 Playing on {self.device_name}: {content.play()}{voice_info}"
         else:
             # For video content, extract audio
@@ -250,21 +284,16 @@ class SmartSpeaker(StreamingDevice):
     
     def adjust_quality(self, quality: str) -> str:
         """Adjust audio quality for smart speaker."""
-        available_qualities = ["standard", "high", "lossless"]
-        if quality in available_qualities:
-            self.current_quality = quality
-            quality_info = {
-                "standard": "Good quality, lower bandwidth",
-                "high": "High quality audio",
-                "lossless": "Premium lossless audio"
-            }
-            return f"Audio quality set to {quality}: {quality_info[quality]}"
-        return f"Quality {quality} not supported. Available: {', '.join(available_qualities)}"
+        description = _SPEAKER_QUALITY_DESC.get(quality)
+        if description is None:
+            return f"Quality {quality} not supported. Available: {self._QUALITIES_STR}"
+        self.current_quality = quality
+        return f"Audio quality set to {quality}: {description}"
     
     def check_compatibility(self, content: MediaContent) -> bool:
         """Check smart speaker compatibility with content."""
         # Smart speakers work best with audio content
-        if hasattr(content, 'artist') or hasattr(content, 'host'):
+        if content.capability_flags & (CAP_ARTIST | CAP_HOST):
             return True  # Music or podcast
         return True  # Can extract audio from video content
     
@@ -274,24 +303,48 @@ class SmartSpeaker(StreamingDevice):
             return "Voice control is disabled."
         
         command = command.lower()
-        if "play" in command:
-            if self.current_content:
-                return f"▶️ Resuming: {self.current_content.title}"
-            return "No content loaded. Please select content first."
-        elif "pause" in command:
-            return "⏸️ Playback paused"
-        elif "volume up" in command:
-            self.volume_level = min(100, self.volume_level + 10)
-            return f"🔊 Volume increased to {self.volume_level}%"
-        elif "volume down" in command:
-            self.volume_level = max(0, self.volume_level - 10)
-            return f"🔉 Volume decreased to {self.volume_level}%"
-        elif "next" in command:
-            return "⏭️ Playing next track"
-        elif "previous" in command:
-            return "⏮️ Playing previous track"
-        else:
-            return f"Command '{command}' not recognized. Try 'play', 'pause', 'volume up/down', 'next', or 'previous'."
+        words = [word.strip(",.!?") for word in command.split()]
+        # Two-word commands ("volume up") are tried before single words
+        for i, word in enumerate(words):
+            handler = None
+            if i + 1 < len(words):
+                handler = self._VOICE_HANDLERS.get(f"{word} {words[i + 1]}")
+            if handler is None:
+                handler = self._VOICE_HANDLERS.get(word)
+            if handler is not None:
+                return handler(self)
+        return f"Command '{command}' not recognized. Try 'play', 'pause', 'volume up/down', 'next', or 'previous'."
+    
+    def _voice_play(self) -> str:
+        if self.current_content:
+            return f"▶️ Resuming: {self.current_content.title}"
+        return "No content loaded. Please select content first."
+    
+    def _voice_pause(self) -> str:
+        return "⏸️ Playback paused"
+    
+    def _voice_volume_up(self) -> str:
+        self.volume_level = _clamp_percent(self.volume_level + 10)
+        return f"🔊 Volume increased to {self.volume_level}%"
+    
+    def _voice_volume_down(self) -> str:
+        self.volume_level = _clamp_percent(self.volume_level - 10)
+        return f"🔉 Volume decreased to {self.volume_level}%"
+    
+    def _voice_next(self) -> str:
+        return "⏭️ Playing next track"
+    
+    def _voice_previous(self) -> str:
+        return "⏮️ Playing previous track"
+    
+    _VOICE_HANDLERS = {
+        "play": _voice_play,
+        "pause": _voice_pause,
+        "volume up": _voice_volume_up,
+        "volume down": _voice_volume_down,
+        "next": _voice_next,
+        "previous": _voice_previous,
+    }
     
     def toggle_voice_control(self) -> str:
         """Toggle voice control feature."""
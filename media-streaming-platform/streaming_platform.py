@@ -2,8 +2,10 @@ from abstract_classes import MediaContent, StreamingDevice, SubscriptionTier
 from media_content import Movie, TVShow, Podcast, Music
 from streaming_devices import SmartTV, Laptop, Mobile, SmartSpeaker
 from user import User
-from typing import List, Dict, Any, Optional, Type
+from typing import List, Dict, Any, Optional, Set, Tuple, Type, Callable
+import heapq
 import random
+from collections import Counter
 from datetime import datetime, timedelta
 
 
@@ -15,130 +17,113 @@ class RecommendationEngine:
         self.user_similarity: Dict[str, List[str]] = {}
         
     def calculate_content_recommendations(self, user: User, 
-                                       available_content: List[MediaContent]) -> List[MediaContent]:
-        """Calculate personalized content recommendations."""
+                                       available_content: List[MediaContent],
+                                       limit: int = 15) -> List[MediaContent]:
+        """Calculate personalized content recommendations (at most limit items).
+        
+        Content-based, collaborative and trending signals are gathered in a
+        single pass over the library, so each item's rating is read once.
+        """
         recommendations = []
-        user_data = user.get_recommendations_data()
         
-        # Content-based filtering
-        content_based = self._content_based_filtering(user, available_content)
+        # Everything that depends only on the user is worked out once, not per item
+        preferred_genres = user.preferences.preferred_genres
+        favorites = set(user.favorites)
+        boost_premium = user.subscription_tier != SubscriptionTier.FREE
+        recent_types = {entry['content_type'] for entry in user.watch_history[-10:]}
+        watched_ids = {entry['content_id'] for entry in user.watch_history}
         
-        # Collaborative filtering (simplified)
-        collaborative = self._collaborative_filtering(user, available_content)
+        content_based = []  # (item, score) for accessible, unfavorited content
+        collaborative = []  # highly rated content the user hasn't watched, in library order
+        trending = []  # (item, trend_score) for all content
         
-        # Trending content
-        trending = self._get_trending_content(available_content)
+        for item in available_content:
+            avg_rating = item.get_average_rating()
+            
+            # Simple trending algorithm based on view count and ratings
+            trend_score = item.view_count
+            if avg_rating:
+                trend_score *= avg_rating
+            trending.append((item, trend_score))
+            
+            # Collaborative filtering (simplified): in a real system this would
+            # analyze similar users' preferences
+            if (len(collaborative) < 8 and avg_rating and avg_rating > 4.0
+                    and item.content_id not in watched_ids):
+                collaborative.append(item)
+            
+            # Content-based filtering on the user's preferences and history
+            can_access, _ = user.can_access_content(item)
+            if not can_access or item.content_id in favorites:  # Don't recommend already favorited
+                continue
+            
+            score = 0
+            
+            # Genre matching
+            if hasattr(item, 'genre') and item.genre in preferred_genres:
+                score += 5
+            
+            # Check average rating
+            if avg_rating and avg_rating > 4.0:
+                score += 3
+            elif avg_rating and avg_rating > 3.5:
+                score += 2
+            
+            # Boost premium content for premium users
+            if boost_premium and item.is_premium_content():
+                score += 2
+            
+            # Content type diversity based on watch history
+            if type(item).__name__ not in recent_types:
+                score += 1  # Encourage diversity
+            
+            content_based.append((item, score))
         
         # Combine recommendations with weights
         all_recommendations = {}
+        candidates = {}  # content_id -> content, only for the scored candidates
         
         # Weight content-based recommendations higher
-        for content in content_based[:10]:
+        for content, _ in heapq.nlargest(10, content_based, key=lambda x: x[1]):
             all_recommendations[content.content_id] = all_recommendations.get(content.content_id, 0) + 3
+            candidates[content.content_id] = content
         
         # Add collaborative recommendations
-        for content in collaborative[:8]:
+        for content in collaborative:
             all_recommendations[content.content_id] = all_recommendations.get(content.content_id, 0) + 2
+            candidates[content.content_id] = content
         
         # Add trending content
-        for content in trending[:5]:
+        for content, _ in heapq.nlargest(5, trending, key=lambda x: x[1]):
             all_recommendations[content.content_id] = all_recommendations.get(content.content_id, 0) + 1
+            candidates[content.content_id] = content
         
-        # Sort by weighted score and return top recommendations
-        sorted_recommendations = sorted(all_recommendations.items(), key=lambda x: x[1], reverse=True)
+        # Take the top recommendations by weighted score; nlargest keeps the
+        # same tie order as a stable sort without sorting everything
+        top_recommendations = heapq.nlargest(limit, all_recommendations.items(), key=lambda x: x[1])
         
         # Convert back to content objects
-        content_dict = {c.content_id: c for c in available_content}
-        for content_id, score in sorted_recommendations[:15]:
-            if content_id in content_dict:
-                recommendations.append(content_dict[content_id])
+        for content_id, score in top_recommendations:
+            recommendations.append(candidates[content_id])
         
         return recommendations
-    
-    def _content_based_filtering(self, user: User, content: List[MediaContent]) -> List[MediaContent]:
-        """Recommend content based on user's preferences and history."""
-        scored_content = []
-        user_prefs = user.preferences.get_all_preferences()
-        
-        for item in content:
-            score = 0
-            
-            # Check if user can access content
-            can_access, _ = user.can_access_content(item)
-            if not can_access:
-                continue
-            
-            # Genre matching
-            if hasattr(item, 'genre') and item.genre in user_prefs['preferred_genres']:
-                score += 5
-            
-            # Check if similar to favorited content
-            if item.content_id not in user.favorites:  # Don't recommend already favorited
-                # Check average rating
-                avg_rating = item.get_average_rating()
-                if avg_rating and avg_rating > 4.0:
-                    score += 3
-                elif avg_rating and avg_rating > 3.5:
-                    score += 2
-                
-                # Boost premium content for premium users
-                if item.is_premium_content() and user.subscription_tier != SubscriptionTier.FREE:
-                    score += 2
-                
-                # Content type diversity based on watch history
-                content_type = type(item).__name__
-                recent_history = user.watch_history[-10:] if len(user.watch_history) > 10 else user.watch_history
-                recent_types = [entry['content_type'] for entry in recent_history]
-                
-                if content_type not in recent_types:
-                    score += 1  # Encourage diversity
-                
-                scored_content.append((item, score))
-        
-        # Sort by score and return
-        scored_content.sort(key=lambda x: x[1], reverse=True)
-        return [item for item, score in scored_content]
-    
-    def _collaborative_filtering(self, user: User, content: List[MediaContent]) -> List[MediaContent]:
-        """Simple collaborative filtering based on similar users."""
-        # In a real system, this would analyze similar users' preferences
-        # For demo purposes, we'll use a simplified approach
-        collaborative_recommendations = []
-        
-        # Find content with high ratings that user hasn't seen
-        for item in content:
-            if item.content_id not in [entry['content_id'] for entry in user.watch_history]:
-                avg_rating = item.get_average_rating()
-                if avg_rating and avg_rating > 4.0:
-                    collaborative_recommendations.append(item)
-        
-        return collaborative_recommendations[:10]
-    
-    def _get_trending_content(self, content: List[MediaContent]) -> List[MediaContent]:
-        """Get trending content based on view count and recent ratings."""
-        trending = []
-        
-        for item in content:
-            # Simple trending algorithm based on view count and ratings
-            trend_score = item.view_count
-            avg_rating = item.get_average_rating()
-            if avg_rating:
-                trend_score *= avg_rating
-            
-            trending.append((item, trend_score))
-        
-        # Sort by trend score and return top items
-        trending.sort(key=lambda x: x[1], reverse=True)
-        return [item for item, score in trending[:15]]
 
 
 class StreamingPlatform:
     """Main streaming platform orchestrator using polymorphism."""
     
-    def __init__(self, platform_name: str):
+    def __init__(self, platform_name: str, clock: Callable[[], datetime] = datetime.now):
         self.platform_name = platform_name
+        self.clock = clock  # source of stream timestamps; swap in a fake for demos/tests
         self.content_library: List[MediaContent] = []
         self.registered_devices: List[StreamingDevice] = []
+        # id lookups for the lists above, so streams don't scan the library
+        self._content_by_id: Dict[str, MediaContent] = {}
+        self._devices_by_id: Dict[str, StreamingDevice] = {}
+        # lowercase trigram -> positions in content_library whose title or description contains it
+        self._trigram_index: Dict[str, Set[int]] = {}
+        # (title, description) lowercased once per item, parallel to content_library
+        self._search_text: List[Tuple[str, str]] = []
         self.users: Dict[str, User] = {}
         self.active_streams: Dict[str, Dict[str, Any]] = {}  # user_id -> stream info
         self.recommendation_engine = RecommendationEngine()
@@ -152,12 +137,23 @@ class StreamingPlatform:
     def add_content(self, content: MediaContent) -> str:
         """Add content to the platform library."""
         self.content_library.append(content)
+        self._content_by_id.setdefault(content.content_id, content)
+        self._index_content(len(self.content_library) - 1, content)
         self.platform_analytics["total_content"] += 1
         return f"Added '{content.title}' to {self.platform_name} library"
     
+    def _index_content(self, position: int, content: MediaContent) -> None:
+        """Add the content's lowercased text and its trigrams to the search index."""
+        texts = (content.title.lower(), content.description.lower())
+        self._search_text.append(texts)
+        for text in texts:
+            for i in range(len(text) - 2):
+                self._trigram_index.setdefault(text[i:i + 3], set()).add(position)
+    
     def register_device(self, device: StreamingDevice) -> str:
         """Register a streaming device."""
         self.registered_devices.append(device)
+        self._devices_by_id.setdefault(device.device_id, device)
         return f"Device '{device.device_name}' registered successfully"
     
     def register_user(self, user: User) -> str:
@@ -174,17 +170,11 @@ class StreamingPlatform:
     
     def get_device_by_id(self, device_id: str) -> Optional[StreamingDevice]:
         """Get device by ID."""
-        for device in self.registered_devices:
-            if device.device_id == device_id:
-                return device
-        return None
+        return self._devices_by_id.get(device_id)
     
     def get_content_by_id(self, content_id: str) -> Optional[MediaContent]:
         """Get content by ID."""
-        for content in self.content_library:
-            if content.content_id == content_id:
-                return content
-        return None
+        return self._content_by_id.get(content_id)
     
     def start_streaming(self, user_id: str, content_id: str, device_id: str) -> str:
         """Start streaming content using polymorphism."""
@@ -223,14 +213,13 @@ class StreamingPlatform:
         stream_result = device.stream_content(content)
         
         # Calculate streaming cost
-        device_type = type(device).__name__.lower().replace('smart', 'smart_')
-        streaming_cost = content.calculate_streaming_cost(device_type, device.current_quality)
+        streaming_cost = content.calculate_streaming_cost(device.device_type, device.current_quality)
         
         # Record active stream
         self.active_streams[user_id] = {
             "content": content,
             "device": device,
-            "start_time": datetime.now(),
+            "start_time": self.clock(),
             "streaming_cost": streaming_cost,
             "quality": device.current_quality
         }
@@ -251,7 +240,7 @@ class StreamingPlatform:
         start_time = stream_info["start_time"]
         
         # Calculate watch duration
-        end_time = datetime.now()
+        end_time = self.clock()
         watch_duration = int((end_time - start_time).total_seconds() / 60)  # minutes
         
         # Add to user's watch history
@@ -263,14 +252,14 @@ class StreamingPlatform:
         
         return f"⏹️ Streaming stopped. Watched for {watch_duration} minutes."
     
-    def get_recommendations(self, user_id: str) -> List[Dict[str, Any]]:
-        """Get personalized recommendations for user."""
+    def get_recommendations(self, user_id: str, limit: int = 15) -> List[Dict[str, Any]]:
+        """Get personalized recommendations for user (only the top limit are formatted)."""
         user = self.authenticate_user(user_id)
         if not user:
             return []
         
         recommendations = self.recommendation_engine.calculate_content_recommendations(
-            user, self.content_library
+            user, self.content_library, limit
         )
         
         # Format recommendations
@@ -304,10 +293,22 @@ class StreamingPlatform:
         results = []
         query_lower = query.lower()
         
-        for content in self.content_library:
+        # Any match must contain every trigram of the query, so only those
+        # items need the substring check; short queries scan everything
+        positions = range(len(self.content_library))
+        if len(query_lower) >= 3:
+            postings = sorted(
+                (self._trigram_index.get(query_lower[i:i + 3], set())
+                 for i in range(len(query_lower) - 2)),
+                key=len
+            )
+            positions = sorted(postings[0].intersection(*postings[1:]))
+        
+        for position in positions:
             # Text search in title and description
-            if (query_lower in content.title.lower() or 
-                query_lower in content.description.lower()):
+            title_lower, description_lower = self._search_text[position]
+            if query_lower in title_lower or query_lower in description_lower:
+                content = self.content_library[position]
                 
                 # Apply filters
                 if content_type and type(content).__name__ != content_type:
@@ -341,19 +342,13 @@ class StreamingPlatform:
                                 self.platform_analytics["total_users"]) * 100
         
         # Content type breakdown
-        content_types = {}
-        for content in self.content_library:
-            content_type = type(content).__name__
-            content_types[content_type] = content_types.get(content_type, 0) + 1
+        content_types = dict(Counter(type(content).__name__ for content in self.content_library))
         
         # Active streams
         active_stream_count = len(self.active_streams)
         
         # Device type breakdown
-        device_types = {}
-        for device in self.registered_devices:
-            device_type = type(device).__name__
-            device_types[device_type] = device_types.get(device_type, 0) + 1
+        device_types = dict(Counter(type(device).__name__ for device in self.registered_devices))
         
         return {
             "platform_name": self.platform_name,
@@ -381,8 +376,7 @@ class StreamingPlatform:
         result = device.adjust_quality(target_quality)
         
         # Update streaming cost
-        device_type = type(device).__name__.lower().replace('smart', 'smart_')
-        new_cost = content.calculate_streaming_cost(device_type, device.current_quality)
+        new_cost = content.calculate_streaming_cost(device.device_type, device.current_quality)
         stream_info["streaming_cost"] = new_cost
         stream_info["quality"] = device.current_quality
         
@@ -395,7 +389,7 @@ class StreamingPlatform:
             return {"error": "User not found"}
         
         # Get recommendations
-        recommendations = self.get_recommendations(user_id)[:5]
+        recommendations = self.get_recommendations(user_id, limit=5)
         
         # Get analytics
         analytics = user.get_watch_analytics()
@@ -409,7 +403,7 @@ class StreamingPlatform:
                 "device_name": stream_info["device"].device_name,
                 "quality": stream_info["quality"],
                 "streaming_cost": stream_info["streaming_cost"],
-                "duration": str(datetime.now() - stream_info["start_time"]).split('.')[0]
+                "duration": str(self.clock() - stream_info["start_time"]).split('.')[0]
             }
         
         return {
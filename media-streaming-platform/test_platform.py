@@ -263,6 +263,13 @@ def test_content_rating_and_recommendations():
     print(f"✅ Average rating: {average_rating} (expected: {expected_average:.2f})")
     assert abs(average_rating - expected_average) < 0.1, f"Rating calculation error: {average_rating} vs {expected_average}"
     
+    # Bulk ratings should match adding them one at a time
+    bulk_movie = Movie("Highly Rated Film", "mov_test_007", "Great movie", "2024-01-01",
+                       ContentRating.PG13, 130, "4K", "Drama", "Acclaimed Director")
+    bulk_movie.add_ratings(ratings)
+    assert bulk_movie.get_average_rating() == average_rating
+    print(f"✅ Bulk-added ratings average: {bulk_movie.get_average_rating()}")
+    
     # Test recommendation impact
     platform = StreamingPlatform("TestStream")
     user = User("user_test_003", "movie_lover", "lover@email.com", 30, SubscriptionTier.PREMIUM)
@@ -289,6 +296,27 @@ def test_content_rating_and_recommendations():
     print()
 
 
+def test_speaker_voice_commands():
+    """Test Case 8: Smart speaker voice command matching"""
+    print("🧪 Test Case 8: Smart speaker voice command matching")
+    
+    speaker = SmartSpeaker("speaker_test_003", "Echo Dot", "Basic", "Alexa")
+    
+    # Commands are matched on whole words, first keyword wins
+    assert speaker.voice_command("Hey Alexa, pause") == "⏸️ Playback paused"
+    assert speaker.voice_command("pause playback") == "⏸️ Playback paused"
+    assert speaker.voice_command("volume up please") == "🔊 Volume increased to 60%"
+    assert speaker.voice_command("Volume down") == "🔉 Volume decreased to 50%"
+    print("✅ Keywords recognized inside longer phrases")
+    
+    # Words that only contain a keyword are not commands
+    for command in ("display", "replay", "unpause"):
+        assert "not recognized" in speaker.voice_command(command)
+    print("✅ Words merely containing a keyword are rejected")
+    
+    print()
+
+
 def run_all_tests():
     """Run all test cases"""
     print("🚀 Starting Media Streaming Platform Test Suite")
@@ -302,6 +330,7 @@ def run_all_tests():
         platform, user = test_user_subscription_platform_integration()
         test_subscription_tier_restrictions()
         test_content_rating_and_recommendations()
+        test_speaker_voice_commands()
         
         print("🎉 ALL TESTS PASSED!")
         print("=" * 60)
@@ -312,6 +341,7 @@ def run_all_tests():
         print("✅ User subscription and platform integration functional")
         print("✅ Subscription tier restrictions enforced")
         print("✅ Content rating and recommendation system operational")
+        print("✅ Smart speaker voice commands matched on whole words")
         
     except Exception as e:
         print(f"❌ TEST FAILED: {e}")
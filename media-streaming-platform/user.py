@@ -332,17 +332,7 @@ class ParentalControls:
             return True
         
         # Check rating
-        rating_values = {
-            ContentRating.G: 0, ContentRating.PG: 1, ContentRating.PG13: 2,
-            ContentRating.R: 3, ContentRating.NC17: 4,
-            ContentRating.TV_Y: 0, ContentRating.TV_G: 1, ContentRating.TV_PG: 2,
-            ContentRating.TV_14: 3, ContentRating.TV_MA: 4
-        }
-        
-        content_rating_value = rating_values.get(content.rating, 5)
-        max_rating_value = rating_values.get(self.max_rating, 0)
-        
-        if content_rating_value > max_rating_value:
+        if content.rating.level > self.max_rating.level:
             return False
         
         # Check blocked genres